@@ -5,10 +5,18 @@ Run with: uvicorn api_server:app --reload --port 8000
 """
 
 from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
+import asyncio
+import json
+import logging
 import os
 import sys
+import uuid
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, List, Dict
 from dotenv import load_dotenv
@@ -19,9 +27,86 @@ load_dotenv('.env', override=True)
 # Add current directory to path so we can import wrapped_grok
 sys.path.insert(0, str(Path(__file__).parent))
 
+from config import load_keys
 from wrapped_grok import WrappedGrok
 
-app = FastAPI(title="Hue API Server")
+# Handlers/format come from the root config set up when wrapped_grok is imported
+logger = logging.getLogger("hue")
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+
+# uvicorn worker processes (read by every worker, since they inherit the environment).
+# The DB read caches are per process and only see that process's writes, so they are
+# only enabled for a single worker - otherwise other workers could serve stale lists.
+WORKERS = int(os.getenv("WEB_CONCURRENCY", "1"))
+DB_CACHE_TTL = 5 if WORKERS == 1 else 0
+
+def _init_sqlite_db():
+    try:
+        from database import ConversationDB as SQLiteDB
+        return SQLiteDB('hue_conversations.db', cache_ttl=DB_CACHE_TTL)
+    except Exception as sqlite_error:
+        logger.error("❌ Failed to initialize both Firebase and SQLite: %s", sqlite_error)
+        raise
+
+# Initialize database (Firebase or SQLite fallback).
+# Firebase is only imported/contacted when credentials are configured - saves cold-start time otherwise.
+db = None
+if (os.getenv('FIREBASE_SERVICE_ACCOUNT_PATH') or os.getenv('FIREBASE_SERVICE_ACCOUNT')
+        or os.getenv('GOOGLE_APPLICATION_CREDENTIALS')):
+    try:
+        from database_firebase import ConversationDB
+        service_account_path = os.getenv('FIREBASE_SERVICE_ACCOUNT_PATH')
+        db = ConversationDB(service_account_path=service_account_path, cache_ttl=DB_CACHE_TTL)
+        logger.info("✅ Using Firebase Firestore")
+    except Exception as e:
+        # Fallback to SQLite
+        db = _init_sqlite_db()
+        logger.warning("⚠️  Firebase initialization failed, using SQLite database")
+        logger.warning("   Error: %s", str(e)[:100])
+else:
+    db = _init_sqlite_db()
+    logger.info("ℹ️  Firebase not configured, using SQLite database")
+
+@lru_cache(maxsize=1)
+def get_hue_instance() -> WrappedGrok:
+    """Create the shared Hue instance on first use (one per worker process)"""
+    keys = load_keys()
+    if keys.error:
+        raise ValueError(keys.error)
+    
+    return WrappedGrok(
+        grok_api_key=keys.grok_api_key,
+        serpapi_key=keys.serpapi_key,
+        silence_timeout=2.0,
+        max_response_words=20,
+        explain_keyword='explain',
+        elevenlabs_api_key=keys.elevenlabs_api_key,
+        elevenlabs_voice_id="21m00Tcm4TlvDq8ikWAM",
+        use_elevenlabs=keys.elevenlabs_ok,
+        enable_voice=False  # Text chat only - don't open the server's microphone
+    )
+
+# Old conversations are pruned periodically instead of on every chat request
+CLEANUP_INTERVAL_SECONDS = 60
+
+async def _cleanup_loop():
+    while True:
+        await asyncio.sleep(CLEANUP_INTERVAL_SECONDS)
+        try:
+            await run_in_threadpool(db.cleanup_old_conversations)
+        except Exception as e:
+            logger.warning("⚠️  Conversation cleanup failed: %s", e)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    cleanup_task = asyncio.create_task(_cleanup_loop())
+    yield
+    cleanup_task.cancel()
+    # Only close the Hue instance if this worker ever created one
+    if get_hue_instance.cache_info().currsize:
+        get_hue_instance().close()
+
+app = FastAPI(title="Hue API Server", default_response_class=ORJSONResponse, lifespan=lifespan)
 
 # CORS middleware to allow Next.js to call this
 app.add_middleware(
@@ -32,53 +117,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize Hue instance
-hue_instance: Optional[WrappedGrok] = None
-
-# Initialize database (Firebase or SQLite fallback)
-db = None
-try:
-    # Try Firebase first
-    from database_firebase import ConversationDB
-    service_account_path = os.getenv('FIREBASE_SERVICE_ACCOUNT_PATH')
-    db = ConversationDB(service_account_path=service_account_path)
-    print("✅ Using Firebase Firestore")
-except Exception as e:
-    # Fallback to SQLite
-    try:
-        from database import ConversationDB as SQLiteDB
-        db = SQLiteDB('hue_conversations.db')
-        print(f"⚠️  Firebase not configured, using SQLite database")
-        print(f"   Error: {str(e)[:100]}")
-    except Exception as sqlite_error:
-        print(f"❌ Failed to initialize both Firebase and SQLite: {sqlite_error}")
-        raise
-
-def get_hue_instance() -> WrappedGrok:
-    global hue_instance
-    if hue_instance is None:
-        grok_api_key = os.getenv('GROK_API_KEY')
-        serpapi_key = os.getenv('SERPAPI_KEY')
-        elevenlabs_api_key = os.getenv('ELEVENLABS_API_KEY')
-        
-        if not grok_api_key or 'your-grok' in grok_api_key.lower():
-            raise ValueError('GROK_API_KEY not set in .env file')
-        
-        if not serpapi_key or 'your-serpapi' in serpapi_key.lower():
-            raise ValueError('SERPAPI_KEY not set in .env file')
-        
-        hue_instance = WrappedGrok(
-            grok_api_key=grok_api_key,
-            serpapi_key=serpapi_key,
-            silence_timeout=2.0,
-            max_response_words=20,
-            explain_keyword='explain',
-            elevenlabs_api_key=elevenlabs_api_key,
-            elevenlabs_voice_id="21m00Tcm4TlvDq8ikWAM",
-            use_elevenlabs=elevenlabs_api_key is not None and 'your-elevenlabs' not in elevenlabs_api_key.lower()
-        )
-    return hue_instance
-
 class ChatRequest(BaseModel):
     message: str
     conversation_id: Optional[str] = None
@@ -102,58 +140,96 @@ class MessageModel(BaseModel):
     content: str
     created_at: Optional[str] = None
 
+
+def _persist_turn(conversation_id: Optional[str], message: str, user_message_id: Optional[str], response_text: str) -> Dict[str, str]:
+    """Store one chat turn (user + assistant messages). Runs in the threadpool.
+    
+    Old conversations are pruned by _cleanup_loop, not here.
+    """
+    # Create the conversation if it doesn't exist yet - a single INSERT-or-ignore,
+    # no existence check first (the existing title is never needed here)
+    if not conversation_id:
+        conversation_id = f"conv-{uuid.uuid4().hex}"
+    conversation_title = message[:30] + "..." if len(message) > 30 else message
+    db.upsert_conversation(conversation_id, conversation_title)
+    
+    # Generate message IDs (random, so concurrent requests can't collide)
+    user_message_id = user_message_id or f"msg-{uuid.uuid4().hex}"
+    assistant_message_id = f"msg-{uuid.uuid4().hex}"
+    
+    # Save both messages to database in one transaction
+    db.add_messages([
+        {'id': user_message_id, 'conversation_id': conversation_id, 'role': 'user', 'content': message},
+        {'id': assistant_message_id, 'conversation_id': conversation_id, 'role': 'assistant', 'content': response_text},
+    ])
+    
+    return {'conversation_id': conversation_id, 'message_id': assistant_message_id}
+
 @app.post("/api/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
     try:
-        import time
+        # Blocking LLM call and DB writes run in the threadpool, not on the event loop
         hue = get_hue_instance()
-        response_text = hue.process_input(request.message)
-        
-        # Get or create conversation
-        conversation_id = request.conversation_id
-        conversation_title = None
+        response_text = await run_in_threadpool(hue.process_input, request.message)
         
-        if not conversation_id:
-            # Create new conversation
-            conversation_id = f"conv-{int(time.time() * 1000)}"
-            conversation_title = request.message[:30] + "..." if len(request.message) > 30 else request.message
-            db.create_conversation(conversation_id, conversation_title)
-        else:
-            # Verify conversation exists
-            existing_conv = db.get_conversation(conversation_id)
-            if not existing_conv:
-                # Conversation doesn't exist, create it
-                conversation_title = request.message[:30] + "..." if len(request.message) > 30 else request.message
-                db.create_conversation(conversation_id, conversation_title)
-            else:
-                conversation_title = existing_conv.get('title')
-        
-        # Generate message IDs
-        timestamp = int(time.time() * 1000)
-        user_message_id = request.message_id or f"msg-{timestamp}"
-        assistant_message_id = f"msg-{timestamp + 1}"
-        
-        # Save messages to database
-        db.add_message(user_message_id, conversation_id, 'user', request.message)
-        db.add_message(assistant_message_id, conversation_id, 'assistant', response_text)
-        
-        # Cleanup old conversations (keep only last 10)
-        db.cleanup_old_conversations()
-        
-        return ChatResponse(
-            response=response_text,
-            conversation_id=conversation_id,
-            message_id=assistant_message_id
+        turn = await run_in_threadpool(
+            _persist_turn,
+            request.conversation_id,
+            request.message,
+            request.message_id,
+            response_text,
         )
+        
+        # All fields are our own strings - returning a response directly skips
+        # response_model validation, like the list endpoints (the model documents the shape)
+        return ORJSONResponse({
+            'response': response_text,
+            'conversation_id': turn['conversation_id'],
+            'message_id': turn['message_id'],
+        })
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """
+    Stream the response as server-sent events while Grok generates it.
+    Each event is {"delta": "..."}; a final "done" event carries the conversation/message IDs
+    once the full turn has been saved.
+    """
+    try:
+        hue = get_hue_instance()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    
+    async def events():
+        chunks = []
+        try:
+            async for chunk in iterate_in_threadpool(hue.stream_input(request.message)):
+                chunks.append(chunk)
+                yield f"data: {json.dumps({'delta': chunk})}\n\n"
+            
+            turn = await run_in_threadpool(
+                _persist_turn,
+                request.conversation_id,
+                request.message,
+                request.message_id,
+                "".join(chunks),
+            )
+            yield f"event: done\ndata: {json.dumps(turn)}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
 
 @app.get("/api/conversations", response_model=List[ConversationModel])
 async def get_conversations():
     """Get all conversations (last 10)"""
     try:
-        conversations = db.get_conversations(limit=10)
-        return [ConversationModel(**conv) for conv in conversations]
+        conversations = await run_in_threadpool(db.get_conversations, limit=10)
+        # Rows come from our own DB - returning a response directly skips
+        # response_model validation (the model is still used for the API docs)
+        return ORJSONResponse(conversations)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -161,8 +237,8 @@ async def get_conversations():
 async def get_messages(conversation_id: str):
     """Get all messages for a conversation"""
     try:
-        messages = db.get_messages(conversation_id)
-        return [MessageModel(**msg) for msg in messages]
+        messages = await run_in_threadpool(db.get_messages, conversation_id)
+        return ORJSONResponse(messages)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -170,7 +246,7 @@ async def get_messages(conversation_id: str):
 async def delete_conversation(conversation_id: str):
     """Delete a conversation"""
     try:
-        db.delete_conversation(conversation_id)
+        await run_in_threadpool(db.delete_conversation, conversation_id)
         return {"status": "deleted"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -179,7 +255,7 @@ async def delete_conversation(conversation_id: str):
 async def update_conversation_title(conversation_id: str, title: str):
     """Update conversation title"""
     try:
-        db.update_conversation_title(conversation_id, title)
+        await run_in_threadpool(db.update_conversation_title, conversation_id, title)
         return {"status": "updated"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -190,15 +266,26 @@ async def health():
 
 if __name__ == "__main__":
     import uvicorn
-    print("════════════════════════════════════════")
-    print("🚀 Starting Hue API Server")
-    print("════════════════════════════════════════")
-    print("📍 Server: http://localhost:8000")
-    print("📍 Health: http://localhost:8000/health")
-    print("📍 API: http://localhost:8000/api/chat")
-    print("════════════════════════════════════════")
-    print("Press Ctrl+C to stop")
-    print("════════════════════════════════════════")
-    print("")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Each worker is a separate process with its own lazily created Hue instance and DB handle
+    logger.info("════════════════════════════════════════")
+    logger.info("🚀 Starting Hue API Server")
+    logger.info("════════════════════════════════════════")
+    logger.info("📍 Server: http://localhost:8000")
+    logger.info("📍 Health: http://localhost:8000/health")
+    logger.info("📍 API: http://localhost:8000/api/chat")
+    logger.info("⚙️  Workers: %d (set WEB_CONCURRENCY to change)", WORKERS)
+    logger.info("════════════════════════════════════════")
+    logger.info("Press Ctrl+C to stop")
+    logger.info("════════════════════════════════════════")
+    # uvloop + httptools are much faster than the default asyncio loop / h11 parser.
+    # loop="auto" picks uvloop when it's installed (it isn't on Windows).
+    # Multiple workers require the import string instead of the app object.
+    uvicorn.run(
+        "api_server:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="auto",
+        http="httptools",
+        workers=WORKERS,
+    )
 
@@ -39,8 +39,12 @@ except ImportError:
         except Exception as e:
             st.warning(f"Could not load .env file: {e}")
 
+from config import load_keys
 from wrapped_grok import WrappedGrok
 
+# Re-read on every rerun so edits to .env show up in the API status panel
+keys = load_keys()
+
 # Initialize session state
 if 'hue' not in st.session_state:
     st.session_state.hue = None
@@ -56,52 +60,48 @@ if 'voice_active' not in st.session_state:
 def initialize_hue():
     """Initialize Hue (WrappedGrok) with API keys."""
     try:
-        grok_api_key = os.getenv('GROK_API_KEY')
-        serpapi_key = os.getenv('SERPAPI_KEY')
-        elevenlabs_api_key = os.getenv('ELEVENLABS_API_KEY')
-        
-        if not grok_api_key or 'your-grok' in grok_api_key.lower():
-            return None, "❌ GROK_API_KEY not set in .env file"
-        
-        if not serpapi_key or 'your-serpapi' in serpapi_key.lower():
-            return None, "❌ SERPAPI_KEY not set in .env file"
+        if keys.error:
+            return None, f"❌ {keys.error}"
         
         hue = WrappedGrok(
-            grok_api_key=grok_api_key,
-            serpapi_key=serpapi_key,
+            grok_api_key=keys.grok_api_key,
+            serpapi_key=keys.serpapi_key,
             silence_timeout=2.0,
             max_response_words=20,
             explain_keyword='explain',
-            elevenlabs_api_key=elevenlabs_api_key,
+            elevenlabs_api_key=keys.elevenlabs_api_key,
             elevenlabs_voice_id="21m00Tcm4TlvDq8ikWAM",
-            use_elevenlabs=elevenlabs_api_key is not None and 'your-elevenlabs' not in elevenlabs_api_key.lower()
+            use_elevenlabs=keys.elevenlabs_ok,
+            enable_voice=False  # Text chat only - don't open and calibrate the microphone
         )
         
         return hue, "✅ Hue initialized successfully"
     except Exception as e:
         return None, f"❌ Error initializing Hue: {str(e)}"
 
-# Theme colors
-theme = st.session_state.get('theme', 'dark')
-is_dark = theme == 'dark'
-
-if is_dark:
-    bg_color = "hsl(0, 0%, 0%)"
-    ring_gradient = "linear-gradient(135deg, #51C4D3 0%, #77ACF1 14%, #EF88AD 28%, #A53860 42%, #670D2F 56%, #E8988A 70%, #FFEAD8 84%, #BA487F 98%, #E1ACAC 100%)"
-    ring_center_bg = "hsl(0, 0%, 0%)"
-    input_bg = "rgba(0, 0, 0, 0.98)"
-    text_color = "#ffffff"
-    input_border = "rgba(81, 196, 211, 0.3)"
-else:
-    bg_color = "hsl(0, 0%, 100%)"
-    ring_gradient = "linear-gradient(135deg, #1e3a8a 0%, #3b82f6 14%, #60a5fa 28%, #93c5fd 42%, #dbeafe 56%, #1d4ed8 70%, #2563eb 84%, #1e40af 100%)"
-    ring_center_bg = "hsl(0, 0%, 100%)"
-    input_bg = "rgba(255, 255, 255, 0.98)"
-    text_color = "#000000"
-    input_border = "rgba(30, 58, 138, 0.3)"
-
-# CSS - CLEAN LAYOUT FROM SCRATCH
-st.markdown(f"""
+@st.cache_data(show_spinner=False)
+def _css(theme: str) -> str:
+    """Build the page CSS for a theme (cached, so reruns don't re-format it)."""
+    # Theme colors
+    is_dark = theme == 'dark'
+    
+    if is_dark:
+        bg_color = "hsl(0, 0%, 0%)"
+        ring_gradient = "linear-gradient(135deg, #51C4D3 0%, #77ACF1 14%, #EF88AD 28%, #A53860 42%, #670D2F 56%, #E8988A 70%, #FFEAD8 84%, #BA487F 98%, #E1ACAC 100%)"
+        ring_center_bg = "hsl(0, 0%, 0%)"
+        input_bg = "rgba(0, 0, 0, 0.98)"
+        text_color = "#ffffff"
+        input_border = "rgba(81, 196, 211, 0.3)"
+    else:
+        bg_color = "hsl(0, 0%, 100%)"
+        ring_gradient = "linear-gradient(135deg, #1e3a8a 0%, #3b82f6 14%, #60a5fa 28%, #93c5fd 42%, #dbeafe 56%, #1d4ed8 70%, #2563eb 84%, #1e40af 100%)"
+        ring_center_bg = "hsl(0, 0%, 100%)"
+        input_bg = "rgba(255, 255, 255, 0.98)"
+        text_color = "#000000"
+        input_border = "rgba(30, 58, 138, 0.3)"
+    
+    # CSS - CLEAN LAYOUT FROM SCRATCH
+    return f"""
 <style>
     * {{
         box-sizing: border-box;
@@ -306,20 +306,20 @@ st.markdown(f"""
         padding: 0 !important;
     }}
 </style>
-""", unsafe_allow_html=True)
+"""
+
+st.markdown(_css(st.session_state.get('theme', 'dark')), unsafe_allow_html=True)
 
 # Sidebar - CONVERSATION HISTORY
 with st.sidebar:
     st.header("💬 Conversation History")
     
     if st.session_state.chat_history:
-        for idx, msg in enumerate(st.session_state.chat_history):
-            if msg["type"] == "user":
-                st.markdown(f'**You:** {msg["content"]}')
-            else:
-                st.markdown(f'**Hue:** {msg["content"]}')
-            if idx < len(st.session_state.chat_history) - 1:
-                st.markdown("---")
+        # One markdown element for the whole history instead of one per message/separator
+        st.markdown("\n\n---\n\n".join(
+            f'**{"You" if msg["type"] == "user" else "Hue"}:** {msg["content"]}'
+            for msg in st.session_state.chat_history
+        ))
     else:
         st.info("No messages yet. Start chatting!")
     
@@ -338,12 +338,9 @@ with st.sidebar:
     st.selectbox("Theme", ["Dark", "Light"], index=0 if st.session_state.theme == 'dark' else 1, key="theme_select", on_change=lambda: setattr(st.session_state, 'theme', 'dark' if st.session_state.theme_select == 'Dark' else 'light') or st.rerun())
     
     with st.expander("API Status"):
-        grok_key = os.getenv('GROK_API_KEY', '')
-        serp_key = os.getenv('SERPAPI_KEY', '')
-        eleven_key = os.getenv('ELEVENLABS_API_KEY', '')
-        st.write(f"{'🟢' if grok_key and 'your-grok' not in grok_key.lower() else '🔴'} Grok")
-        st.write(f"{'🟢' if serp_key and 'your-serpapi' not in serp_key.lower() else '🔴'} SerpAPI")
-        st.write(f"{'🟢' if eleven_key and 'your-elevenlabs' not in eleven_key.lower() else '🔴'} ElevenLabs")
+        st.write(f"{'🟢' if keys.grok_ok else '🔴'} Grok")
+        st.write(f"{'🟢' if keys.serpapi_ok else '🔴'} SerpAPI")
+        st.write(f"{'🟢' if keys.elevenlabs_ok else '🔴'} ElevenLabs")
 
 # MAIN PAGE - CLEAN SPLIT SCREEN
 st.markdown('<div class="main-wrapper">', unsafe_allow_html=True)
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Shared API key configuration for the Hue entrypoints (api_server.py, app.py)
+and the placeholder check used by the helper scripts
+Call load_keys() after .env has been loaded; it re-reads the environment each time
+"""
+
+import os
+import re
+from typing import NamedTuple, Optional
+
+class HueKeys(NamedTuple):
+    grok_api_key: Optional[str]
+    serpapi_key: Optional[str]
+    elevenlabs_api_key: Optional[str]
+    grok_ok: bool
+    serpapi_ok: bool
+    elevenlabs_ok: bool
+    
+    @property
+    def error(self) -> Optional[str]:
+        """First missing required key, or None when Hue can be started"""
+        if not self.grok_ok:
+            return 'GROK_API_KEY not set in .env file'
+        if not self.serpapi_ok:
+            return 'SERPAPI_KEY not set in .env file'
+        return None
+
+# Placeholder fragments from setup_env.sh and the docs - one case-insensitive scan per value
+_PLACEHOLDER_RE = re.compile(r'your-grok|your-xai|your-serpapi|your-elevenlabs|placeholder|example|xxx', re.I)
+
+def is_placeholder(key: Optional[str]) -> bool:
+    """True when an API key is unset or still a template value"""
+    return not key or _PLACEHOLDER_RE.search(key) is not None
+
+def load_keys() -> HueKeys:
+    """Read and validate the API keys from the current environment"""
+    grok_api_key = os.getenv('GROK_API_KEY')
+    serpapi_key = os.getenv('SERPAPI_KEY')
+    elevenlabs_api_key = os.getenv('ELEVENLABS_API_KEY')
+    
+    return HueKeys(
+        grok_api_key=grok_api_key,
+        serpapi_key=serpapi_key,
+        elevenlabs_api_key=elevenlabs_api_key,
+        grok_ok=not is_placeholder(grok_api_key),
+        serpapi_ok=not is_placeholder(serpapi_key),
+        elevenlabs_ok=not is_placeholder(elevenlabs_api_key),
+    )
@@ -4,16 +4,38 @@ Database models and operations for conversation storage
 Uses SQLite for production-ready conversation memory
 """
 
-from sqlalchemy import create_engine, Column, String, Integer, Float, Text, DateTime
+from sqlalchemy import create_engine, event, func, insert, select, update, bindparam, Index, Column, String, Text, DateTime
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
-from datetime import datetime
-from typing import List, Optional, Dict
-import json
-from pathlib import Path
+from sqlalchemy.orm import sessionmaker, scoped_session, Session
+from sqlalchemy.pool import QueuePool
+from cachetools import TTLCache
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Iterator, List, Optional, Dict
+import itertools
+import threading
 
 Base = declarative_base()
 
+# Applied to every new pooled connection: WAL lets readers run during writes,
+# synchronous=NORMAL is safe with WAL and avoids an fsync per commit
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-64000",
+)
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
 class Conversation(Base):
     __tablename__ = 'conversations'
     
@@ -33,8 +55,13 @@ class Conversation(Base):
 class Message(Base):
     __tablename__ = 'messages'
     
+    # Serves get_messages (filter by conversation, ordered by time) straight from the index
+    __table_args__ = (
+        Index('ix_msg_conv_created', 'conversation_id', 'created_at'),
+    )
+    
     id = Column(String, primary_key=True)
-    conversation_id = Column(String, nullable=False, index=True)
+    conversation_id = Column(String, nullable=False)
     role = Column(String, nullable=False)  # 'user' or 'assistant'
     content = Column(Text, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -48,23 +75,109 @@ class Message(Base):
             'created_at': self.created_at.isoformat() if self.created_at else None,
         }
 
+def _row_to_dict(row) -> Dict:
+    """Convert a Core result row to the same dict shape as the models' to_dict()"""
+    data = dict(row)
+    for key in ('created_at', 'updated_at'):
+        if data.get(key) is not None:
+            data[key] = data[key].isoformat()
+    return data
+
+# Chat-path statements built once at import (api_server's _persist_turn and the
+# UI's polling reads). Core statements skip the ORM's identity map and attribute instrumentation.
+_conversations = Conversation.__table__
+_messages = Message.__table__
+_UPSERT_CONV = sqlite_insert(_conversations).values(
+    id=bindparam('conv_id'),
+    title=bindparam('conv_title'),
+    created_at=bindparam('ts'),
+    updated_at=bindparam('ts'),
+).on_conflict_do_nothing(index_elements=['id'])
+_INSERT_MSG = insert(_messages)
+_TOUCH_CONVS = (
+    update(_conversations)
+    .where(_conversations.c.id.in_(bindparam('conv_ids', expanding=True)))
+    .values(updated_at=bindparam('ts'))
+)
+_LIST_CONVS = select(_conversations).order_by(_conversations.c.updated_at.desc())
+_GET_MESSAGES = (
+    select(_messages)
+    .where(_messages.c.conversation_id == bindparam('conv_id'))
+    .order_by(_messages.c.created_at.asc())
+)
+_UPDATE_CONV_TITLE = (
+    update(_conversations)
+    .where(_conversations.c.id == bindparam('conv_id'))
+    .values(title=bindparam('new_title'), updated_at=bindparam('ts'))
+)
+
 class ConversationDB:
     """Database manager for conversations"""
     
-    def __init__(self, db_path: str = 'hue_conversations.db'):
+    def __init__(self, db_path: str = 'hue_conversations.db', cache_ttl: float = 5):
         self.db_path = db_path
-        self.engine = create_engine(f'sqlite:///{db_path}', echo=False)
+        # Pooled connections are reused across calls instead of reopening the file every query.
+        # check_same_thread=False because FastAPI runs DB calls from its threadpool.
+        self.engine = create_engine(
+            f'sqlite:///{db_path}',
+            echo=False,
+            poolclass=QueuePool,
+            pool_size=8,
+            connect_args={'check_same_thread': False},
+        )
+        event.listen(self.engine, 'connect', _set_sqlite_pragmas)
         Base.metadata.create_all(self.engine)
-        self.SessionLocal = sessionmaker(bind=self.engine)
+        # create_all skips existing tables, so add the composite index to older databases too
+        for index in Message.__table__.indexes:
+            index.create(self.engine, checkfirst=True)
+        self.SessionLocal = scoped_session(sessionmaker(bind=self.engine))
         self.MAX_CONVERSATIONS = 10
+        
+        # Short-lived read caches - the UI polls these, data only changes on writes below.
+        # They are per process and only invalidated by this process's writes, so pass
+        # cache_ttl=0 (caching off) when several processes share the database.
+        self._cache_lock = threading.Lock()
+        self._conversations_cache = TTLCache(maxsize=8, ttl=cache_ttl)  # keyed by limit
+        self._messages_cache = TTLCache(maxsize=128, ttl=cache_ttl)  # keyed by conversation_id
+        # Generations are bumped on every invalidation; a read only caches its result if
+        # the generation it started under is unchanged, so a query that raced a write
+        # can't put pre-write rows back into the cache.
+        self._generation_counter = itertools.count(1)
+        self._conversations_gen = 0
+        self._messages_gen: Dict[str, int] = {}
+        self._messages_gen_floor = 0  # generation of ids missing from _messages_gen
+    
+    def _invalidate(self, *conversation_ids: str, all_messages: bool = False):
+        """Drop cached conversation lists (and the given conversations' messages)"""
+        with self._cache_lock:
+            self._conversations_cache.clear()
+            self._conversations_gen = next(self._generation_counter)
+            if all_messages:
+                self._messages_cache.clear()
+                self._messages_gen.clear()
+                self._messages_gen_floor = next(self._generation_counter)
+            for conversation_id in conversation_ids:
+                self._messages_cache.pop(conversation_id, None)
+                self._messages_gen[conversation_id] = next(self._generation_counter)
     
     def get_session(self) -> Session:
         return self.SessionLocal()
     
+    @contextmanager
+    def session_scope(self) -> Iterator[Session]:
+        """Thread-local session that is rolled back on error and released afterwards"""
+        session = self.SessionLocal()
+        try:
+            yield session
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            self.SessionLocal.remove()
+    
     def create_conversation(self, conversation_id: str, title: str) -> Conversation:
         """Create a new conversation"""
-        session = self.get_session()
-        try:
+        with self.session_scope() as session:
             conversation = Conversation(
                 id=conversation_id,
                 title=title,
@@ -74,105 +187,140 @@ class ConversationDB:
             session.add(conversation)
             session.commit()
             session.refresh(conversation)
-            return conversation
-        finally:
-            session.close()
+        self._invalidate(conversation_id)
+        return conversation
+    
+    def upsert_conversation(self, conversation_id: str, title: str) -> bool:
+        """Create a conversation unless it already exists. Returns True if it was created."""
+        with self.session_scope() as session:
+            created = session.execute(_UPSERT_CONV, {
+                'conv_id': conversation_id,
+                'conv_title': title,
+                'ts': datetime.utcnow(),
+            }).rowcount == 1
+            session.commit()
+        if created:
+            self._invalidate(conversation_id)
+        return created
     
     def get_conversations(self, limit: Optional[int] = None) -> List[Dict]:
         """Get all conversations, ordered by most recent first"""
-        session = self.get_session()
-        try:
-            query = session.query(Conversation).order_by(Conversation.updated_at.desc())
-            if limit:
-                query = query.limit(limit)
-            conversations = query.all()
-            return [conv.to_dict() for conv in conversations]
-        finally:
-            session.close()
+        with self._cache_lock:
+            cached = self._conversations_cache.get(limit)
+            generation = self._conversations_gen
+        if cached is not None:
+            return [dict(conv) for conv in cached]
+        
+        statement = _LIST_CONVS.limit(limit) if limit else _LIST_CONVS
+        with self.session_scope() as session:
+            conversations = [_row_to_dict(row) for row in session.execute(statement).mappings()]
+        
+        with self._cache_lock:
+            if self._conversations_gen == generation:
+                self._conversations_cache[limit] = conversations
+        # Copies, so callers can't modify the cached rows
+        return [dict(conv) for conv in conversations]
     
     def get_conversation(self, conversation_id: str) -> Optional[Dict]:
         """Get a single conversation"""
-        session = self.get_session()
-        try:
+        with self.session_scope() as session:
             conversation = session.query(Conversation).filter_by(id=conversation_id).first()
             return conversation.to_dict() if conversation else None
-        finally:
-            session.close()
     
     def update_conversation_title(self, conversation_id: str, title: str):
         """Update conversation title"""
-        session = self.get_session()
-        try:
-            conversation = session.query(Conversation).filter_by(id=conversation_id).first()
-            if conversation:
-                conversation.title = title
-                conversation.updated_at = datetime.utcnow()
-                session.commit()
-        finally:
-            session.close()
+        with self.session_scope() as session:
+            session.execute(_UPDATE_CONV_TITLE, {
+                'conv_id': conversation_id,
+                'new_title': title,
+                'ts': datetime.utcnow(),
+            })
+            session.commit()
+        self._invalidate()
     
     def delete_conversation(self, conversation_id: str):
         """Delete a conversation and all its messages"""
-        session = self.get_session()
-        try:
+        with self.session_scope() as session:
             # Delete messages first
             session.query(Message).filter_by(conversation_id=conversation_id).delete()
             # Delete conversation
             session.query(Conversation).filter_by(id=conversation_id).delete()
             session.commit()
-        finally:
-            session.close()
+        self._invalidate(conversation_id)
     
     def add_message(self, message_id: str, conversation_id: str, role: str, content: str):
         """Add a message to a conversation"""
-        session = self.get_session()
-        try:
-            message = Message(
-                id=message_id,
-                conversation_id=conversation_id,
-                role=role,
-                content=content,
-                created_at=datetime.utcnow()
-            )
-            session.add(message)
-            # Update conversation's updated_at
-            conversation = session.query(Conversation).filter_by(id=conversation_id).first()
-            if conversation:
-                conversation.updated_at = datetime.utcnow()
+        self.add_messages([{
+            'id': message_id,
+            'conversation_id': conversation_id,
+            'role': role,
+            'content': content,
+        }])
+    
+    def add_messages(self, rows: List[Dict]):
+        """
+        Add several messages in one transaction (one INSERT + one UPDATE).
+        Each row needs 'id', 'conversation_id', 'role' and 'content'; rows keep their order.
+        """
+        if not rows:
+            return
+        now = datetime.utcnow()
+        # Offset timestamps so messages from the same call still sort in order
+        values = [
+            {**row, 'created_at': now + timedelta(microseconds=i)}
+            for i, row in enumerate(rows)
+        ]
+        conversation_ids = {row['conversation_id'] for row in rows}
+        with self.session_scope() as session:
+            session.execute(_INSERT_MSG, values)
+            session.execute(_TOUCH_CONVS, {
+                'conv_ids': list(conversation_ids),
+                'ts': values[-1]['created_at'],
+            })
             session.commit()
-        finally:
-            session.close()
+        self._invalidate(*conversation_ids)
     
     def get_messages(self, conversation_id: str) -> List[Dict]:
         """Get all messages for a conversation"""
-        session = self.get_session()
-        try:
-            messages = session.query(Message).filter_by(
-                conversation_id=conversation_id
-            ).order_by(Message.created_at.asc()).all()
-            return [msg.to_dict() for msg in messages]
-        finally:
-            session.close()
+        with self._cache_lock:
+            cached = self._messages_cache.get(conversation_id)
+            generation = self._messages_gen.get(conversation_id, self._messages_gen_floor)
+        if cached is not None:
+            return [dict(msg) for msg in cached]
+        
+        with self.session_scope() as session:
+            rows = session.execute(_GET_MESSAGES, {'conv_id': conversation_id}).mappings()
+            messages = [_row_to_dict(row) for row in rows]
+        
+        with self._cache_lock:
+            if self._messages_gen.get(conversation_id, self._messages_gen_floor) == generation:
+                self._messages_cache[conversation_id] = messages
+        return [dict(msg) for msg in messages]
+    
+    def iter_messages(self, conversation_id: str) -> Iterator[Dict]:
+        """Yield a conversation's messages oldest first (local reads, so this just walks get_messages)"""
+        yield from self.get_messages(conversation_id)
     
     def cleanup_old_conversations(self):
         """Keep only the last MAX_CONVERSATIONS conversations"""
-        session = self.get_session()
-        try:
-            # Get all conversations ordered by updated_at
-            all_conversations = session.query(Conversation).order_by(
-                Conversation.updated_at.desc()
-            ).all()
+        with self.session_scope() as session:
+            # Cheap probe - nothing to do in the common case
+            count = session.query(func.count(Conversation.id)).scalar()
+            if count <= self.MAX_CONVERSATIONS:
+                return
             
-            # Keep only the most recent ones
-            if len(all_conversations) > self.MAX_CONVERSATIONS:
-                to_delete = all_conversations[self.MAX_CONVERSATIONS:]
-                for conv in to_delete:
-                    # Delete messages first
-                    session.query(Message).filter_by(conversation_id=conv.id).delete()
-                    # Delete conversation
-                    session.delete(conv)
-                session.commit()
-        finally:
-            session.close()
-
-
+            # Delete everything outside the most recent ones in two bulk statements
+            keep_ids = select(Conversation.id).order_by(
+                Conversation.updated_at.desc()
+            ).limit(self.MAX_CONVERSATIONS).scalar_subquery()
+            # Delete messages first
+            session.query(Message).filter(
+                ~Message.conversation_id.in_(keep_ids)
+            ).delete(synchronize_session=False)
+            # Delete conversations
+            session.query(Conversation).filter(
+                ~Conversation.id.in_(keep_ids)
+            ).delete(synchronize_session=False)
+            session.commit()
+        
+        self._invalidate(all_messages=True)
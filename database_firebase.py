@@ -6,15 +6,51 @@ Production-ready with real-time capabilities
 
 import firebase_admin
 from firebase_admin import credentials, firestore
-from typing import List, Optional, Dict
-from datetime import datetime
+from google.api_core.exceptions import AlreadyExists, Aborted, DeadlineExceeded
+from cachetools import TTLCache
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, List, Optional, Dict
+from datetime import datetime, timedelta, timezone
+from functools import cached_property, lru_cache
+import asyncio
+import itertools
+import logging
 import os
-from pathlib import Path
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=1)
+def _get_client():
+    """Process-wide Firestore client - its gRPC channel is shared by every ConversationDB"""
+    return firestore.client()
+
+def _warm_up(client):
+    """Open the gRPC channel and auth token with a tiny read so the first real query doesn't pay for it"""
+    try:
+        list(client.collection('conversations').limit(1).select([]).stream())
+    except Exception as e:
+        logger.debug(f"Firestore warm-up failed: {e}")
+
+def _iso(data: Dict, keys=('created_at', 'updated_at')) -> Dict:
+    """Convert Firestore timestamps to ISO strings in place (reads always return DatetimeWithNanoseconds)"""
+    for key in keys:
+        value = data.get(key)
+        if value is not None:
+            data[key] = value.isoformat()
+    return data
 
 class ConversationDB:
-    """Firebase Firestore database manager for conversations"""
+    """
+    Firebase Firestore database manager for conversations.
     
-    def __init__(self, service_account_path: Optional[str] = None):
+    Methods are synchronous so this class stays interchangeable with the SQLite
+    ConversationDB; api_server.py calls them through run_in_threadpool, which
+    keeps Firestore round trips off the event loop.
+    """
+    
+    def __init__(self, service_account_path: Optional[str] = None, cache_ttl: float = 5):
         self.MAX_CONVERSATIONS = 10
         
         # Initialize Firebase Admin SDK
@@ -39,25 +75,88 @@ class ConversationDB:
                         "service_account_path, or set GOOGLE_APPLICATION_CREDENTIALS. Error: " + str(e)
                     )
         
-        self.db = firestore.client()
-        self.conversations_ref = self.db.collection('conversations')
-        self.messages_ref = self.db.collection('messages')
+        self.db = _get_client()
+        threading.Thread(target=_warm_up, args=(self.db,), daemon=True).start()
+        
+        # Short-lived read caches, same TTL as the SQLite backend - other workers
+        # write to Firestore too, so entries must not outlive a few polls (cache_ttl=0 turns them off)
+        self._cache_lock = threading.Lock()
+        self._conversation_cache = TTLCache(maxsize=128, ttl=cache_ttl)  # keyed by conversation_id
+        self._messages_cache = TTLCache(maxsize=128, ttl=cache_ttl)  # keyed by conversation_id
+        # Same generation scheme as the SQLite backend: reads only cache their result if
+        # no invalidation of that conversation happened while they were running
+        self._generation_counter = itertools.count(1)
+        self._generations: Dict[str, int] = {}
+        self._generation_floor = 0  # generation of ids missing from _generations
+    
+    def _invalidate(self, conversation_id: str):
+        """Drop one conversation and its messages from the read caches"""
+        with self._cache_lock:
+            self._conversation_cache.pop(conversation_id, None)
+            self._messages_cache.pop(conversation_id, None)
+            self._generations[conversation_id] = next(self._generation_counter)
+    
+    def _generation(self, conversation_id: str) -> int:
+        """Current cache generation of a conversation (call with _cache_lock held)"""
+        return self._generations.get(conversation_id, self._generation_floor)
+    
+    @cached_property
+    def conversations_ref(self):
+        return self.db.collection('conversations')
+    
+    def _messages_ref(self, conversation_id: str):
+        """Messages live in a subcollection: conversations/{id}/messages"""
+        return self.conversations_ref.document(conversation_id).collection('messages')
+    
+    def _legacy_messages(self, conversation_id: str, fields: Optional[List[str]] = None):
+        """
+        Messages written before the subcollection layout, from the old top-level
+        'messages' collection. Still read and deleted so older conversations keep working.
+        """
+        query = self.db.collection('messages').where('conversation_id', '==', conversation_id)
+        if fields is not None:
+            query = query.select(fields)
+        return query.stream()
     
     def create_conversation(self, conversation_id: str, title: str) -> Dict:
         """Create a new conversation"""
+        # Timestamps are assigned by the Firestore server (no client clock skew)
         conversation_data = {
             'id': conversation_id,
             'title': title,
-            'created_at': datetime.utcnow(),
-            'updated_at': datetime.utcnow(),
+            'created_at': firestore.SERVER_TIMESTAMP,
+            'updated_at': firestore.SERVER_TIMESTAMP,
         }
-        self.conversations_ref.document(conversation_id).set(conversation_data)
-        return conversation_data
+        result = self.conversations_ref.document(conversation_id).set(conversation_data)
+        self._invalidate(conversation_id)
+        # SERVER_TIMESTAMP resolves to the commit time, which the write result carries
+        committed_at = result.update_time.isoformat()
+        return {**conversation_data, 'created_at': committed_at, 'updated_at': committed_at}
+    
+    def upsert_conversation(self, conversation_id: str, title: str) -> bool:
+        """Create a conversation unless it already exists. Returns True if it was created."""
+        try:
+            # create() fails if the document exists - one round trip, no read first
+            self.conversations_ref.document(conversation_id).create({
+                'id': conversation_id,
+                'title': title,
+                'created_at': firestore.SERVER_TIMESTAMP,
+                'updated_at': firestore.SERVER_TIMESTAMP,
+            })
+            self._invalidate(conversation_id)
+            return True
+        except AlreadyExists:
+            return False
     
-    def get_conversations(self, limit: Optional[int] = None) -> List[Dict]:
-        """Get all conversations, ordered by most recent first"""
+    def get_conversations(self, limit: Optional[int] = None, fields: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Get all conversations, ordered by most recent first.
+        fields limits which document fields are downloaded (e.g. ['id', 'title']).
+        """
         query = self.conversations_ref.order_by('updated_at', direction=firestore.Query.DESCENDING)
         
+        if fields:
+            query = query.select(fields)
         if limit:
             query = query.limit(limit)
         
@@ -65,26 +164,27 @@ class ConversationDB:
         for doc in query.stream():
             conv_data = doc.to_dict()
             if conv_data:
-                # Convert Firestore timestamps to ISO strings
-                if 'created_at' in conv_data and hasattr(conv_data['created_at'], 'isoformat'):
-                    conv_data['created_at'] = conv_data['created_at'].isoformat()
-                if 'updated_at' in conv_data and hasattr(conv_data['updated_at'], 'isoformat'):
-                    conv_data['updated_at'] = conv_data['updated_at'].isoformat()
+                _iso(conv_data)
                 conversations.append(conv_data)
         
         return conversations
     
     def get_conversation(self, conversation_id: str) -> Optional[Dict]:
         """Get a single conversation"""
+        with self._cache_lock:
+            cached = self._conversation_cache.get(conversation_id)
+            generation = self._generation(conversation_id)
+        if cached is not None:
+            return dict(cached)
+        
         doc = self.conversations_ref.document(conversation_id).get()
         if doc.exists:
             conv_data = doc.to_dict()
             if conv_data:
-                # Convert Firestore timestamps to ISO strings
-                if 'created_at' in conv_data and hasattr(conv_data['created_at'], 'isoformat'):
-                    conv_data['created_at'] = conv_data['created_at'].isoformat()
-                if 'updated_at' in conv_data and hasattr(conv_data['updated_at'], 'isoformat'):
-                    conv_data['updated_at'] = conv_data['updated_at'].isoformat()
+                _iso(conv_data)
+                with self._cache_lock:
+                    if self._generation(conversation_id) == generation:
+                        self._conversation_cache[conversation_id] = dict(conv_data)
             return conv_data
         return None
     
@@ -92,61 +192,185 @@ class ConversationDB:
         """Update conversation title"""
         self.conversations_ref.document(conversation_id).update({
             'title': title,
-            'updated_at': datetime.utcnow(),
+            'updated_at': firestore.SERVER_TIMESTAMP,
         })
+        self._invalidate(conversation_id)
+    
+    def _delete_with_retry(self, ref, attempts: int = 4):
+        """Delete one document, retrying transient errors with exponential backoff"""
+        for attempt in range(attempts):
+            try:
+                ref.delete()
+                return
+            except (Aborted, DeadlineExceeded):
+                if attempt == attempts - 1:
+                    raise
+                time.sleep(0.1 * (2 ** attempt))
     
-    def delete_conversation(self, conversation_id: str):
-        """Delete a conversation and all its messages"""
-        # Delete all messages for this conversation
-        messages_query = self.messages_ref.where('conversation_id', '==', conversation_id).stream()
-        for msg_doc in messages_query:
-            msg_doc.reference.delete()
+    def delete_conversation(self, conversation_id: str, batched: bool = True):
+        """
+        Delete a conversation and all its messages.
         
-        # Delete conversation
-        self.conversations_ref.document(conversation_id).delete()
+        batched=True uses a BulkWriter (fewest RPCs). batched=False deletes each
+        message independently on a thread pool, so one failed delete doesn't
+        affect the others.
+        """
+        conversation_ref = self.conversations_ref.document(conversation_id)
+        self._invalidate(conversation_id)
+        legacy_refs = [doc.reference for doc in self._legacy_messages(conversation_id, [])]
+        if batched:
+            if legacy_refs:
+                writer = self.db.bulk_writer()
+                for ref in legacy_refs:
+                    writer.delete(ref)
+                writer.close()
+            # Deletes the document and its messages subcollection using a BulkWriter
+            self.db.recursive_delete(conversation_ref)
+            return
+        
+        # Only document references are needed - select([]) skips transferring message bodies
+        message_refs = [doc.reference for doc in self._messages_ref(conversation_id).select([]).stream()]
+        message_refs += legacy_refs
+        if message_refs:
+            # Deletes are I/O bound - gains level off around 40 concurrent requests
+            with ThreadPoolExecutor(max_workers=min(40, len(message_refs))) as executor:
+                list(executor.map(self._delete_with_retry, message_refs))
+        self._delete_with_retry(conversation_ref)
     
     def add_message(self, message_id: str, conversation_id: str, role: str, content: str):
         """Add a message to a conversation"""
-        message_data = {
+        # Same write path (and clock) as add_messages, so messages always sort consistently
+        self.add_messages([{
             'id': message_id,
             'conversation_id': conversation_id,
             'role': role,
             'content': content,
-            'created_at': datetime.utcnow(),
-        }
-        self.messages_ref.document(message_id).set(message_data)
+        }])
+    
+    def add_messages(self, rows: List[Dict]):
+        """
+        Add several messages (and each conversation's updated_at) in a single batched commit.
+        Each row needs 'id', 'conversation_id', 'role' and 'content'; rows keep their order.
+        """
+        if not rows:
+            return
+        # Every message created_at comes from this clock: server timestamps in one commit
+        # would all be equal, and the offsets below keep messages from the same call in order
+        now = datetime.now(timezone.utc)
+        batch = self.db.batch()
+        conversation_ids = set()
+        for i, row in enumerate(rows):
+            message_data = {**row, 'created_at': now + timedelta(microseconds=i)}
+            batch.set(self._messages_ref(row['conversation_id']).document(row['id']), message_data)
+            conversation_ids.add(row['conversation_id'])
         
-        # Update conversation's updated_at
-        self.conversations_ref.document(conversation_id).update({
-            'updated_at': datetime.utcnow(),
-        })
+        # Update each conversation's updated_at
+        for conversation_id in conversation_ids:
+            batch.update(self.conversations_ref.document(conversation_id), {
+                'updated_at': firestore.SERVER_TIMESTAMP,
+            })
+        batch.commit()
+        
+        # Re-read on the next get_messages so cached rows always match what Firestore returns
+        for conversation_id in conversation_ids:
+            self._invalidate(conversation_id)
+    
+    def iter_messages(self, conversation_id: str) -> Iterator[Dict]:
+        """Yield a conversation's messages oldest first, as the query stream delivers them"""
+        with self._cache_lock:
+            cached = self._messages_cache.get(conversation_id)
+            generation = self._generation(conversation_id)
+        if cached is not None:
+            yield from [dict(msg) for msg in cached]
+            return
+        
+        # Conversations from before the subcollection layout keep (some of) their
+        # messages in the old top-level collection - usually this comes back empty
+        legacy = [msg for msg in (doc.to_dict() for doc in self._legacy_messages(conversation_id)) if msg]
+        # Subcollection read, ordered server-side (single-field index, no filter needed)
+        query = self._messages_ref(conversation_id).order_by('created_at')
+        if legacy:
+            # Merge both sources; the old collection has no (conversation_id, created_at) index
+            rows = legacy + [msg for msg in (doc.to_dict() for doc in query.stream()) if msg]
+            rows.sort(key=lambda msg: msg.get('created_at') or datetime.min.replace(tzinfo=timezone.utc))
+        else:
+            rows = (msg for msg in (doc.to_dict() for doc in query.stream()) if msg)
+        
+        messages = []
+        for msg_data in rows:
+            _iso(msg_data, ('created_at',))
+            messages.append(msg_data)
+            yield dict(msg_data)  # The cached row stays private
+        
+        # Only cache once the stream was read to the end, and only if no write raced it
+        with self._cache_lock:
+            if self._generation(conversation_id) == generation:
+                self._messages_cache[conversation_id] = messages
     
     def get_messages(self, conversation_id: str) -> List[Dict]:
         """Get all messages for a conversation"""
-        messages = []
-        # Query by conversation_id, then sort in Python (avoids index requirement)
-        query = self.messages_ref.where('conversation_id', '==', conversation_id)
+        return list(self.iter_messages(conversation_id))
+    
+    def watch_messages(self, conversation_id: str, callback: Callable[[Dict], None]):
+        """
+        Call callback(message) for each message in a conversation, existing ones first,
+        then new ones as they are written. Changes are pushed over one listener stream
+        instead of re-running the query. Returns the watch - call .unsubscribe() to stop.
         
-        for doc in query.stream():
-            msg_data = doc.to_dict()
-            if msg_data:
-                # Convert Firestore timestamps to ISO strings
-                if 'created_at' in msg_data and hasattr(msg_data['created_at'], 'isoformat'):
-                    msg_data['created_at'] = msg_data['created_at'].isoformat()
-                messages.append(msg_data)
+        callback runs on the Firestore listener thread.
+        """
+        query = self._messages_ref(conversation_id).order_by('created_at')
         
-        # Sort by created_at in Python
-        messages.sort(key=lambda x: x.get('created_at', ''))
-        return messages
+        def on_snapshot(_snapshot, changes, _read_time):
+            for change in changes:
+                if change.type.name != 'ADDED':
+                    continue
+                msg_data = change.document.to_dict()
+                if msg_data:
+                    callback(_iso(msg_data, ('created_at',)))
+        
+        return query.on_snapshot(on_snapshot)
+    
+    def watch_messages_queue(self, conversation_id: str, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """
+        watch_messages bridged into an asyncio.Queue, for `while True: msg = await queue.get()`.
+        Must be called from the event loop (or given one). Returns (queue, watch).
+        """
+        loop = loop or asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        watch = self.watch_messages(
+            conversation_id,
+            lambda message: loop.call_soon_threadsafe(queue.put_nowait, message),
+        )
+        return queue, watch
     
     def cleanup_old_conversations(self):
         """Keep only the last MAX_CONVERSATIONS conversations"""
-        # Get more than we need to ensure we can delete extras
-        all_conversations = self.get_conversations(limit=self.MAX_CONVERSATIONS + 5)
-        
-        # Keep only the most recent ones
-        if len(all_conversations) > self.MAX_CONVERSATIONS:
-            to_delete = all_conversations[self.MAX_CONVERSATIONS:]
-            for conv in to_delete:
-                self.delete_conversation(conv['id'])
+        # Skip the newest MAX_CONVERSATIONS server-side; select([]) returns bare
+        # references, so no document fields are downloaded
+        query = (self.conversations_ref
+                 .order_by('updated_at', direction=firestore.Query.DESCENDING)
+                 .offset(self.MAX_CONVERSATIONS)
+                 .select([]))
+        stale = list(query.stream())
+        if not stale:
+            return
+        
+        # One BulkWriter for every stale conversation and its messages - a single
+        # flush at the end instead of one recursive_delete flush per conversation
+        writer = self.db.bulk_writer()
+        for doc in stale:
+            for message in self._messages_ref(doc.id).select([]).stream():
+                writer.delete(message.reference)
+            for message in self._legacy_messages(doc.id, []):
+                writer.delete(message.reference)
+            writer.delete(doc.reference)
+            self._invalidate(doc.id)
+        writer.close()
+        
+        # Deleted ids would otherwise keep their generations forever; raising the floor
+        # keeps every in-flight read from caching while the table is reset
+        with self._cache_lock:
+            self._generations.clear()
+            self._generation_floor = next(self._generation_counter)
 
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Minimal .env reader for the helper scripts (example_voice_chat.py, test_grok_api.py)
+"""
+
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict
+
+# KEY=VALUE on its own line; comment lines never match because of the lookahead
+_ENV_RE = re.compile(r'^(?![ \t]*#)[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*(.*?)[ \t\r]*$', re.M)
+
+@lru_cache(maxsize=1)
+def read_env_file(path: str) -> Dict[str, str]:
+    """Parse KEY=VALUE lines from an env file (read once per process)"""
+    return dict(_ENV_RE.findall(Path(path).read_text()))
+
+def load_env_file(path: str) -> Dict[str, str]:
+    """Copy an env file into os.environ, overriding shell values like load_dotenv(override=True)"""
+    values = read_env_file(path)
+    os.environ.update(values)
+    return values
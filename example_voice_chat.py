@@ -13,52 +13,30 @@ try:
     DOTENV_AVAILABLE = True
 except ImportError:
     DOTENV_AVAILABLE = False
-    # Fallback: manually parse .env file
-    env_path = Path(__file__).parent / '.env'
-    if env_path.exists():
-        try:
-            with open(env_path, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#') and '=' in line:
-                        key, value = line.split('=', 1)
-                        os.environ[key.strip()] = value.strip()
-            print("✅ Loaded .env file manually (python-dotenv not installed)")
-        except Exception as e:
-            print(f"⚠️  Could not load .env file manually: {e}")
-    else:
-        print("Note: python-dotenv not installed. Install with: pip install python-dotenv")
-        print("You can still use environment variables: export GROK_API_KEY='your-key'")
 
+from config import is_placeholder
+from env_file import load_env_file
 from wrapped_grok import WrappedGrok
 
+ENV_PATH = Path(__file__).parent / '.env'
+
 def main():
     # Load environment variables from .env file if available
-    if DOTENV_AVAILABLE:
-        env_path = Path(__file__).parent / '.env'
-        if env_path.exists():
-            load_dotenv(env_path, override=True)  # Force override shell env vars
-            print(f"✅ Loaded environment variables from {env_path} (override=True)")
-        else:
-            print(f"⚠️  .env file not found at {env_path}")
-            print("Run ./setup_env.sh to create .env file, or set environment variables:")
-            print("  export GROK_API_KEY='your-key'")
-            print("  export SERPAPI_KEY='your-key'")
+    if not ENV_PATH.exists():
+        print(f"⚠️  .env file not found at {ENV_PATH}")
+        print("Run ./setup_env.sh to create .env file, or set environment variables:")
+        print("  export GROK_API_KEY='your-key'")
+        print("  export SERPAPI_KEY='your-key'")
+    elif DOTENV_AVAILABLE:
+        load_dotenv(ENV_PATH, override=True)  # Force override shell env vars
+        print(f"✅ Loaded environment variables from {ENV_PATH} (override=True)")
     else:
-        # Fallback: manually parse .env file and override
-        if env_path.exists():
-            try:
-                with open(env_path, 'r') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and not line.startswith('#') and '=' in line:
-                            key, value = line.split('=', 1)
-                            os.environ[key.strip()] = value.strip()  # Overwrites existing
-                print(f"✅ Loaded .env file manually (override=True)")
-            except Exception as e:
-                print(f"⚠️  Could not load .env file: {e}")
-        else:
-            print("⚠️  python-dotenv not installed and .env file not found")
+        # Fallback: parse .env ourselves and override
+        try:
+            load_env_file(str(ENV_PATH))
+            print(f"✅ Loaded .env file manually (python-dotenv not installed, override=True)")
+        except Exception as e:
+            print(f"⚠️  Could not load .env file: {e}")
     
     # Get API keys from environment variables
     grok_api_key = os.getenv('GROK_API_KEY')
@@ -66,9 +44,7 @@ def main():
     elevenlabs_api_key = os.getenv('ELEVENLABS_API_KEY')  # Optional - for better TTS
     
     # Check for placeholder API keys
-    placeholder_patterns = ['your-grok', 'your-xai', 'your-serpapi', 'placeholder', 'example']
-    
-    if not grok_api_key or any(pattern in grok_api_key.lower() for pattern in placeholder_patterns):
+    if is_placeholder(grok_api_key):
         print("\n❌ ERROR: GROK_API_KEY not set or still using placeholder value")
         print(f"   Current value: {grok_api_key[:30] if grok_api_key else 'NOT SET'}...")
         print("\n📝 To fix:")
@@ -85,7 +61,7 @@ def main():
         print("4. Save and try again")
         return
     
-    if not serpapi_key or any(pattern in serpapi_key.lower() for pattern in placeholder_patterns):
+    if is_placeholder(serpapi_key):
         print("\n❌ ERROR: SERPAPI_KEY not set or still using placeholder value")
         print(f"   Current value: {serpapi_key[:30] if serpapi_key else 'NOT SET'}...")
         print("\n📝 To fix:")
@@ -7,6 +7,9 @@ import os
 import sys
 from pathlib import Path
 
+from config import is_placeholder
+from env_file import load_env_file, read_env_file
+
 # Try to load from .env file
 env_path = Path(__file__).parent / '.env'
 print(f"📁 Looking for .env file at: {env_path}")
@@ -24,15 +27,8 @@ except ImportError:
     print("⚠️  python-dotenv not installed, manually loading .env file...")
     if env_path.exists():
         try:
-            with open(env_path, 'r') as f:
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    if line and not line.startswith('#') and '=' in line:
-                        key, value = line.split('=', 1)
-                        key = key.strip()
-                        value = value.strip()
-                        os.environ[key] = value  # This overwrites existing env vars
-                        print(f"   Loaded: {key}={value[:10]}... (from line {line_num}, override=True)")
+            for key, value in load_env_file(str(env_path)).items():
+                print(f"   Loaded: {key}={value[:10]}... (override=True)")
             print("✅ Loaded .env file manually")
         except Exception as e:
             print(f"❌ Error reading .env file: {e}")
@@ -40,22 +36,44 @@ except ImportError:
         print("❌ .env file not found")
 
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+def _make_session() -> requests.Session:
+    """One keep-alive connection for every probe, with backoff on transient errors"""
+    session = requests.Session()
+    retry = Retry(
+        total=2,
+        backoff_factor=0.2,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset({'GET', 'POST'}),
+        raise_on_status=False,  # Hand the last response back so its status can be printed
+    )
+    session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=5, max_retries=retry))
+    return session
+
+def _probe(session: requests.Session, api_url: str, headers: dict, model: str) -> requests.Response:
+    """Send a tiny prompt to one model"""
+    payload = {
+        "model": model,
+        "messages": [
+            {"role": "user", "content": "Say hello"}
+        ]
+    }
+    return session.post(api_url, headers=headers, json=payload, timeout=10)
 
 def test_grok_api():
     print("\n🔍 Checking for GROK_API_KEY...")
     
-    # Also check what's directly in .env file
+    # Also check what's directly in .env file (parsed once, reused here)
     env_path = Path(__file__).parent / '.env'
     if env_path.exists():
         print(f"\n📄 Reading .env file directly...")
         try:
-            with open(env_path, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith('GROK_API_KEY=') and not line.startswith('#'):
-                        key_from_file = line.split('=', 1)[1].strip()
-                        print(f"   Key in .env file: {key_from_file[:15]}...{key_from_file[-10:] if len(key_from_file) > 25 else ''} (length: {len(key_from_file)})")
-                        break
+            key_from_file = read_env_file(str(env_path)).get('GROK_API_KEY')
+            if key_from_file:
+                print(f"   Key in .env file: {key_from_file[:15]}...{key_from_file[-10:] if len(key_from_file) > 25 else ''} (length: {len(key_from_file)})")
         except Exception as e:
             print(f"   ⚠️  Could not read .env file: {e}")
     
@@ -75,20 +93,9 @@ def test_grok_api():
         return False
     
     # Check for placeholder values
-    placeholder_patterns = [
-        'your-grok-api-key-here',
-        'your-grok',
-        'your-xai',
-        'placeholder',
-        'example',
-        'xxx',
-        'test'
-    ]
-    
-    key_lower = grok_api_key.lower()
-    is_placeholder = any(pattern in key_lower for pattern in placeholder_patterns) or len(grok_api_key) < 20
+    placeholder = is_placeholder(grok_api_key) or len(grok_api_key) < 20
     
-    if is_placeholder:
+    if placeholder:
         print("❌ ERROR: GROK_API_KEY appears to be a placeholder or too short")
         print(f"   Current value: {grok_api_key[:15]}...")
         print("\n📝 To fix:")
@@ -111,6 +118,7 @@ def test_grok_api():
     
     # Test different endpoints and models (grok-3 is the current model)
     api_url = "https://api.x.ai/v1/chat/completions"
+    models_url = "https://api.x.ai/v1/models"
     models = ["grok-3", "grok-beta", "grok-2", "grok-vision-beta", "grok"]
     
     headers = {
@@ -118,67 +126,87 @@ def test_grok_api():
         "Content-Type": "application/json"
     }
     
-    test_message = {
-        "model": None,  # Will be set for each attempt
-        "messages": [
-            {"role": "user", "content": "Say hello"}
-        ]
-    }
+    session = _make_session()
+    
+    # Ask which models the key can use first - a metadata GET instead of billable completions
+    print(f"\n📋 Listing available models: {models_url}")
+    try:
+        response = session.get(models_url, headers=headers, timeout=5)
+        if response.status_code == 401:
+            print(f"  ❌ Unauthorized (401): Invalid API key")
+            print(f"  Response: {response.text[:200]}")
+            return False
+        if response.status_code == 200:
+            advertised = {m.get('id') for m in response.json().get('data', [])}
+            print(f"  Available: {', '.join(sorted(m for m in advertised if m))}")
+            available = [model for model in models if model in advertised]
+            if available:
+                models = available[:1]
+            else:
+                print("  ⚠️  None of the known model names are listed, probing them all")
+        else:
+            print(f"  ⚠️  Model listing returned {response.status_code}, probing all models")
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"  ⚠️  Could not list models ({type(e).__name__}), probing all models")
     
     print(f"\nTesting API endpoint: {api_url}")
+    if len(models) > 1:
+        print(f"Probing {len(models)} models concurrently - the first one that answers wins")
     print("=" * 60)
     
-    for model in models:
-        print(f"\n🔍 Testing model: {model}")
-        test_message["model"] = model
-        
-        try:
-            response = requests.post(
-                api_url,
-                headers=headers,
-                json=test_message,
-                timeout=10
-            )
+    # Hedged probes: worst case is one timeout instead of one per model
+    executor = ThreadPoolExecutor(max_workers=len(models))
+    futures = {executor.submit(_probe, session, api_url, headers, model): model for model in models}
+    try:
+        for future in as_completed(futures):
+            model = futures[future]
+            print(f"\n🔍 Result for model: {model}")
             
-            print(f"  Status Code: {response.status_code}")
-            
-            if response.status_code == 200:
-                result = response.json()
-                content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
-                print(f"  ✅ SUCCESS! Model '{model}' works!")
-                print(f"  Response: {content[:100]}...")
-                return True
-            elif response.status_code == 401:
-                print(f"  ❌ Unauthorized (401): Invalid API key")
-                print(f"  Response: {response.text[:200]}")
-                return False
-            elif response.status_code == 400:
-                error_text = response.text
-                print(f"  ⚠️  Bad Request (400)")
-                print(f"  Response: {error_text[:300]}")
-                if "model" in error_text.lower() and "invalid" in error_text.lower():
-                    print(f"  → Model '{model}' not available, trying next...")
-                    continue
-                else:
+            try:
+                response = future.result()
+                
+                print(f"  Status Code: {response.status_code}")
+                
+                if response.status_code == 200:
+                    result = response.json()
+                    content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
+                    print(f"  ✅ SUCCESS! Model '{model}' works!")
+                    print(f"  Response: {content[:100]}...")
+                    return True
+                elif response.status_code == 401:
+                    print(f"  ❌ Unauthorized (401): Invalid API key")
+                    print(f"  Response: {response.text[:200]}")
+                    return False
+                elif response.status_code == 400:
+                    error_text = response.text
+                    print(f"  ⚠️  Bad Request (400)")
+                    print(f"  Response: {error_text[:300]}")
+                    if "model" in error_text.lower() and "invalid" in error_text.lower():
+                        print(f"  → Model '{model}' not available, waiting for the others...")
+                        continue
+                    else:
+                        return False
+                elif response.status_code == 404:
+                    print(f"  ❌ Not Found (404): Endpoint doesn't exist")
+                    print(f"  Response: {response.text[:200]}")
                     return False
-            elif response.status_code == 404:
-                print(f"  ❌ Not Found (404): Endpoint doesn't exist")
-                print(f"  Response: {response.text[:200]}")
+                else:
+                    print(f"  ⚠️  Unexpected status: {response.status_code}")
+                    print(f"  Response: {response.text[:200]}")
+                    
+            except requests.exceptions.ConnectionError as e:
+                print(f"  ❌ Connection Error: Cannot reach {api_url}")
+                print(f"  Error: {e}")
                 return False
-            else:
-                print(f"  ⚠️  Unexpected status: {response.status_code}")
-                print(f"  Response: {response.text[:200]}")
-                
-        except requests.exceptions.ConnectionError as e:
-            print(f"  ❌ Connection Error: Cannot reach {api_url}")
-            print(f"  Error: {e}")
-            return False
-        except requests.exceptions.Timeout:
-            print(f"  ❌ Timeout: API request took too long")
-            return False
-        except Exception as e:
-            print(f"  ❌ Unexpected Error: {type(e).__name__}: {e}")
-            return False
+            except requests.exceptions.Timeout:
+                print(f"  ❌ Timeout: API request took too long")
+                return False
+            except Exception as e:
+                print(f"  ❌ Unexpected Error: {type(e).__name__}: {e}")
+                return False
+    finally:
+        # Don't wait on probes still in flight once we have an answer
+        executor.shutdown(wait=False, cancel_futures=True)
     
     print("\n❌ All models failed. Check your API key and account status at https://console.x.ai")
     return False
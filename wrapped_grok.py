@@ -1,49 +1,144 @@
+import difflib
+import hashlib
+import math
+import os
 import time
 import threading
 import logging
+import logging.handlers
 import re
+import shutil
+import string
 import subprocess
-from typing import Optional, Callable, List, Dict
-from queue import Queue
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, as_completed, wait
+from collections import deque
+from functools import cached_property
+from typing import Optional, Callable, Iterable, Iterator, List, Dict, Union
+import itertools
+from pathlib import Path
+from queue import Full, Queue
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from cachetools import LRUCache, TTLCache
 
 # Configure logging first
+# violations.log is written in batches of 64 records (or right away on ERROR) instead of one write per record
+_log_file_handler = logging.FileHandler('violations.log')
+_log_file_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler('violations.log'),
+        logging.handlers.MemoryHandler(capacity=64, flushLevel=logging.ERROR, target=_log_file_handler),
         logging.StreamHandler()
     ]
 )
 logger = logging.getLogger('WrappedGrok')
 
-try:
-    from serpapi import GoogleSearch
-except ImportError:
-    # Fallback for different package structures
+# Statements that might need verification: years, "is/was" statements, cited studies, percentages.
+# One alternation, compiled once - a single scan per sentence instead of one per pattern
+_CLAIM_RE = re.compile(
+    r"\b(?:\d{4}\b|(?:is|was|are|were)\s+\w|according to|studies show|research indicates|percent|%)",
+    re.IGNORECASE,
+)
+_SENTENCE_SPLIT_RE = re.compile(r"[.!?]+")
+_NON_WORD_RE = re.compile(r"\W+")
+# End of a sentence inside streamed text (terminator followed by whitespace)
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+_CLAUSE_END_RE = re.compile(r"(?<=[,;:])\s+")
+
+# Enhanced system prompt optimized for high-quality, informative answers (matches web app quality)
+SYSTEM_PROMPT = """You are Grok, an advanced AI assistant created by xAI. 
+Your goal is to provide accurate, insightful, and helpful answers that demonstrate deep understanding.
+
+Quality guidelines:
+- Provide detailed, well-reasoned answers that show you understand the topic thoroughly
+- When web search context is provided, use it to give current, factual, and accurate information
+- Be thorough but clear - explain concepts with relevant details and context
+- If asked to explain something, provide comprehensive information with examples when helpful
+- Be conversational, natural, and engaging - write like you're helping a friend understand
+- If uncertain about something, acknowledge it rather than speculating
+- When using information from web search, synthesize it naturally into a coherent answer
+- Prioritize accuracy, helpfulness, and completeness
+- Think through your answers before responding to ensure quality"""
+_BASE_SYSTEM_MSG = {"role": "system", "content": SYSTEM_PROMPT}
+# Appended to the system prompt when web search found something
+_CONTEXT_TEMPLATE = "\n\n=== Current Web Search Context (use this to inform your answer) ===\n{context}\n=== End of Web Search Context ===\n\nUse this context to provide an accurate, detailed, and helpful answer. Synthesize the information naturally into your response."
+
+_PUNCTUATION_TABLE = str.maketrans("", "", string.punctuation)
+_SEARCH_QUERY_MAX = 150  # Longest query sent to SerpAPI (and longest search cache key)
+
+def _clip_query(query: str) -> str:
+    """Cut a search query to _SEARCH_QUERY_MAX chars at a word boundary - no half words sent to SerpAPI."""
+    if len(query) <= _SEARCH_QUERY_MAX:
+        return query
+    # One char past the limit tells us whether the cut lands exactly on a word end
+    words = query[:_SEARCH_QUERY_MAX + 1].rsplit(None, 1)
+    if len(words) < 2 or not words[0]:
+        return query[:_SEARCH_QUERY_MAX]  # A single huge "word" - plain cut
+    return words[0]
+
+def _normalize_query(query: str) -> str:
+    """Search cache key: lowercase, no punctuation, single spaces, at most _SEARCH_QUERY_MAX chars."""
+    return _clip_query(" ".join(query.lower().translate(_PUNCTUATION_TABLE).split()))
+
+# Backchannels ("uh-huh", "yeah") that shouldn't cut the assistant off mid-sentence
+_FILLER_WORDS = frozenset({
+    "um", "uh", "uhm", "hmm", "mhm", "yeah", "yep", "ok", "okay",
+    "right", "like", "so", "well", "ah", "oh",
+})
+
+def _is_filler(text: str) -> bool:
+    """True when a transcript is nothing but filler words."""
+    words = text.lower().translate(_PUNCTUATION_TABLE).split()
+    return bool(words) and _FILLER_WORDS.issuperset(words)
+
+# Short inputs worth a web search: numbers, mid-sentence capitals (names), question words
+_FACTUAL_CUE_RE = re.compile(r"\d|(?<=\s)[A-Z]|(?i:\b(?:who|what|when|where|why|how|which)\b)")
+_SMALLTALK_WORDS = frozenset({
+    "hi", "hello", "hey", "thanks", "thank", "bye", "goodbye", "yes", "no", "ok", "okay",
+})
+
+def _is_small_talk(text: str) -> bool:
+    """True for short conversational input (3 words or fewer) that a web search won't help."""
+    words = text.lower().translate(_PUNCTUATION_TABLE).split()
+    if len(words) > 3 or _CLAIM_RE.search(text):
+        return False
+    return bool(_SMALLTALK_WORDS.intersection(words)) or _FACTUAL_CUE_RE.search(text) is None
+
+def _snippet_fingerprint(snippet: str) -> str:
+    """First 60 chars of a snippet ignoring case and punctuation - equal for near-duplicates."""
+    return _NON_WORD_RE.sub(" ", snippet.lower()).strip()[:60]
+
+# Optional - only needed for the semantic response cache, imported by _load_embedder()
+np = None
+
+# Audio support - required for voice chat, imported on first use by _load_audio()
+# so text-only callers (the API server) never load SpeechRecognition or PortAudio
+sr = None
+
+def _load_audio() -> bool:
+    """Import speech_recognition and check for PyAudio. Returns True when voice chat can run."""
+    global sr
+    if sr is not None:
+        return True
     try:
-        from serpapi.google_search import GoogleSearch
+        import speech_recognition
     except ImportError:
-        logger.warning("SerpAPI not installed. Web search features disabled.")
-        GoogleSearch = None
-
-# Audio support - required for voice chat
-try:
-    import speech_recognition as sr
+        logger.warning("SpeechRecognition not installed. Voice chat disabled.")
+        return False
     try:
-        import pyaudio
-        AUDIO_AVAILABLE = True
-        logger.info("Audio support initialized successfully")
+        import pyaudio  # noqa: F401 - sr.Microphone opens PortAudio through it
     except ImportError:
         logger.warning("PyAudio not installed. Voice chat requires PyAudio.")
         logger.warning("Install with: brew install portaudio && pip install pyaudio")
-        AUDIO_AVAILABLE = False
-        sr = None
-except ImportError:
-    AUDIO_AVAILABLE = False
-    sr = None
-    logger.warning("SpeechRecognition not installed. Voice chat disabled.")
+        return False
+    sr = speech_recognition
+    logger.info("Audio support initialized successfully")
+    return True
 
 
 class WrappedGrok:
@@ -65,7 +160,10 @@ class WrappedGrok:
         explain_keyword: str = 'explain',
         elevenlabs_api_key: Optional[str] = None,
         elevenlabs_voice_id: str = "21m00Tcm4TlvDq8ikWAM",  # Rachel - clear female voice
-        use_elevenlabs: bool = True
+        use_elevenlabs: bool = True,
+        enable_semantic_cache: bool = True,
+        response_cache_ttl: float = 3600.0,
+        enable_voice: bool = True
     ):
         """
         Initialize WrappedGrok.
@@ -79,14 +177,51 @@ class WrappedGrok:
             elevenlabs_api_key: API key for ElevenLabs (optional, for better TTS)
             elevenlabs_voice_id: Voice ID for ElevenLabs (default: Rachel)
             use_elevenlabs: Whether to use ElevenLabs for TTS (True) or system say (False)
+            enable_semantic_cache: Reuse answers to near-identical questions (needs sentence-transformers)
+            response_cache_ttl: Seconds a cached Grok answer stays valid
+            enable_voice: Open and calibrate the microphone (False for text-only use)
         """
         self.grok_api_key = grok_api_key
         self.grok_api_url = "https://api.x.ai/v1/chat/completions"  # xAI Grok API endpoint
         self.serpapi_key = serpapi_key
+        self.serpapi_url = "https://serpapi.com/search.json"
         self.silence_timeout = silence_timeout
         self.max_response_words = max_response_words
         self.explain_keyword = explain_keyword.lower()
         
+        # Pooled HTTP sessions (Grok and SerpAPI) - keep-alive connections are reused
+        # across requests (and across threads) instead of a new TCP + TLS handshake per call
+        self._http = self._make_session()
+        self._http.headers.update({
+            "Authorization": f"Bearer {self.grok_api_key}",
+            "Content-Type": "application/json"
+        })
+        self._serp_http = self._make_session()
+        
+        # Grok answer caches: exact (same input + search context) and semantic (rephrased questions)
+        self._cache_lock = threading.Lock()
+        self._exact_cache = TTLCache(maxsize=512, ttl=response_cache_ttl)
+        self.response_cache_ttl = response_cache_ttl
+        self.enable_semantic_cache = enable_semantic_cache
+        self._embedder = None  # Loaded in the background - lookups skip the semantic tier until ready
+        self._sem_vectors = None  # (n, dim) matrix of normalized question embeddings
+        self._sem_entries: List[tuple] = []  # (timestamp, answer) per row of _sem_vectors
+        if self.enable_semantic_cache:
+            threading.Thread(target=self._load_embedder, daemon=True).start()
+        
+        # Web search results by normalized query (topics recur within a session; empty results
+        # are cached too), and
+        # factual-claim extraction results (a pure function of the text)
+        self._serp_cache = TTLCache(maxsize=1024, ttl=600)
+        self._claim_cache = LRUCache(maxsize=256)
+        
+        # Background work for a turn (web search overlapped with a speculative Grok call)
+        self._pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="wrapped-grok")
+        self._preferred_model: Optional[str] = None  # First model that answered; skips the fan-out
+        self._speculation: Optional[tuple] = None  # (interim transcript, Future of its answer) while listening
+        # Open the TLS connections now - the sessions keep them alive, so the first turn skips the handshakes
+        self._pool.submit(self._warm_connections)
+        
         # ElevenLabs TTS configuration
         self.elevenlabs_api_key = elevenlabs_api_key
         self.elevenlabs_voice_id = elevenlabs_voice_id
@@ -119,38 +254,163 @@ class WrappedGrok:
         else:
             logger.info("ℹ️  Using system TTS (say command) - ElevenLabs API key not provided")
         
+        # Synthesized ElevenLabs audio: small in-memory hot tier over an on-disk LRU
+        self._tts_hot_cache = LRUCache(maxsize=32)
+        self._tts_cache_dir: Optional[Path] = Path.home() / ".cache" / "wrapped_grok_tts"
+        try:
+            self._tts_cache_dir.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            logger.warning(f"⚠️  TTS disk cache disabled: {e}")
+            self._tts_cache_dir = None
+        # System TTS: fixed phrases are rendered once to disk and played back with afplay
+        self._say_cache_enabled = bool(self._tts_cache_dir and shutil.which("say") and shutil.which("afplay"))
+        if enable_voice and self._say_cache_enabled and not self.use_elevenlabs:
+            self._pool.submit(self._warm_say_cache)
+        
         # Audio components - REQUIRED for voice chat
-        self.audio_available = AUDIO_AVAILABLE
-        if not self.audio_available:
+        self.enable_voice = enable_voice
+        self.audio_available = enable_voice and _load_audio()
+        self.recognizer = None
+        self.microphone = None
+        self._mic_lock = threading.Lock()  # One reader at a time on the shared microphone stream
+        self._ambient_calibrated_at = 0.0
+        self._listens_since_calibration = 0
+        if enable_voice and not self.audio_available:
             raise RuntimeError(
                 "Audio support is required for voice chat. "
                 "Install PyAudio: brew install portaudio && pip install pyaudio"
             )
         
-        try:
-            self.recognizer = sr.Recognizer()
-            self.recognizer.energy_threshold = 4000  # Adjust for ambient noise
-            self.recognizer.pause_threshold = 0.8
-            self.microphone = sr.Microphone()
-            # Calibrate microphone
-            logger.info("Calibrating microphone for ambient noise...")
-            with self.microphone as source:
-                self.recognizer.adjust_for_ambient_noise(source, duration=2)
-            logger.info("Audio initialized successfully")
-        except Exception as e:
-            logger.error(f"Audio initialization failed: {e}")
-            raise RuntimeError(f"Failed to initialize audio: {e}") from e
+        if enable_voice:
+            try:
+                self.recognizer = sr.Recognizer()
+                self.recognizer.energy_threshold = 4000  # Adjust for ambient noise
+                self.recognizer.pause_threshold = 0.8
+                # 16 kHz is all speech recognition needs; larger chunks mean fewer PortAudio reads per second
+                self.microphone = sr.Microphone(sample_rate=16000, chunk_size=2048)
+                # Open the stream once and keep it open - every listen reads from it
+                # instead of paying for a PortAudio open (and a calibration) per turn
+                self.microphone.__enter__()
+                logger.info("Calibrating microphone for ambient noise...")
+                self._calibrate(duration=2)
+                logger.info("Audio initialized successfully")
+            except Exception as e:
+                logger.error(f"Audio initialization failed: {e}")
+                raise RuntimeError(f"Failed to initialize audio: {e}") from e
+        self._speech_client = None
+        if self.audio_available:
+            self._init_streaming_recognition()
         
         self.speaking = False
         self.interrupt_speech = False
-        self.speech_thread: Optional[threading.Thread] = None
-        self.background_listener_stop = None  # Function to stop background listener
+        self._interrupt_event = threading.Event()  # Set together with interrupt_speech, for blocking waits
+        # One reused speech worker: utterances play in order and no thread is created per speak()
+        self._speech_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="wrapped-grok-tts")
+        self.speech_future: Optional[Future] = None
+        self._tts_proc: Optional[subprocess.Popen] = None  # say process currently speaking, if any
+        self._ignore_audio_until = 0.0  # Interruption audio before this time is our own TTS starting up
+        self._interrupt_recognizer = None  # Created with the listener thread on first speech
+        self._listen_enabled = threading.Event()  # Interruption listener runs while this is set
+        self._listener_closed = False
         
         # State management
         self.is_listening = False
         self.last_audio_time = None
-        self.audio_queue = Queue()
-        self.violations = []
+        self.violations = deque(maxlen=self.MAX_VIOLATIONS)  # (timestamp, message); oldest drop off in long sessions
+    
+    @staticmethod
+    def _make_session() -> requests.Session:
+        """requests.Session with a connection pool and backoff on transient errors"""
+        retry = Retry(
+            total=2,
+            backoff_factor=0.2,
+            status_forcelist=[429, 502, 503, 504],
+            allowed_methods=frozenset({"GET", "POST"}),
+            raise_on_status=False,  # Callers inspect the final response's status code
+        )
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=retry)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+    
+    def _warm_connections(self):
+        """Open pooled connections to xAI and SerpAPI ahead of the first request."""
+        for session, url in ((self._http, "https://api.x.ai/v1/models"), (self._serp_http, "https://serpapi.com/")):
+            try:
+                session.head(url, timeout=5)
+            except requests.RequestException as e:
+                logger.debug("Connection warm-up failed for %s: %s", url, e)
+    
+    SEMANTIC_CACHE_THRESHOLD = 0.90  # Cosine similarity for "same question"
+    SEMANTIC_CACHE_SIZE = 256
+    
+    def _load_embedder(self):
+        """Load the small on-device embedding model for the semantic cache."""
+        global np
+        try:
+            import numpy
+            from sentence_transformers import SentenceTransformer
+            np = numpy
+            self._embedder = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
+            logger.info("✅ Semantic response cache enabled")
+        except ImportError:
+            self.enable_semantic_cache = False
+            logger.info("ℹ️  sentence-transformers not installed - using exact-match response cache only")
+        except Exception as e:
+            self.enable_semantic_cache = False
+            logger.warning(f"⚠️  Semantic cache disabled: {e}")
+    
+    @staticmethod
+    def _cache_key(user_input: str, context: Optional[str]) -> str:
+        return hashlib.sha1((user_input + "|" + (context or "")).encode()).hexdigest()
+    
+    def _cached_response(self, user_input: str, context: Optional[str]):
+        """
+        Look up a previous Grok answer. Returns (answer or None, question embedding or None);
+        the embedding is passed back to _store_response so it isn't computed twice.
+        The semantic tier only holds answers given without search context - its key is
+        the question alone, so an answer built on different context could be returned.
+        """
+        key = self._cache_key(user_input, context)
+        with self._cache_lock:
+            answer = self._exact_cache.get(key)
+        if answer is not None:
+            logger.info("Response cache hit (exact)")
+            return answer, None
+        
+        embedder = self._embedder
+        if context is not None or not self.enable_semantic_cache or embedder is None:
+            return None, None
+        
+        query = embedder.encode(user_input, normalize_embeddings=True)
+        now = time.time()
+        with self._cache_lock:
+            if self._sem_vectors is None:
+                return None, query
+            scores = self._sem_vectors @ query  # Cosine similarity (rows are normalized)
+            best = int(scores.argmax())
+            stored_at, answer = self._sem_entries[best]
+            if scores[best] >= self.SEMANTIC_CACHE_THRESHOLD and now - stored_at < self.response_cache_ttl:
+                logger.info("Response cache hit (semantic, similarity %.2f)", scores[best])
+                return answer, query
+        return None, query
+    
+    def _store_response(self, user_input: str, context: Optional[str], answer: str, query=None):
+        """Remember a successful Grok answer (semantic tier only when a query embedding is given)."""
+        if not answer or answer.startswith("Error:"):
+            return
+        with self._cache_lock:
+            self._exact_cache[self._cache_key(user_input, context)] = answer
+            if query is None:
+                return
+            # Drop expired rows, then the oldest ones past the size cap
+            now = time.time()
+            keep = [i for i, (stored_at, _) in enumerate(self._sem_entries)
+                    if now - stored_at < self.response_cache_ttl][-(self.SEMANTIC_CACHE_SIZE - 1):]
+            vectors = [self._sem_vectors[i] for i in keep] + [query]
+            self._sem_entries = [self._sem_entries[i] for i in keep] + [(now, answer)]
+            self._sem_vectors = np.vstack(vectors)
     
     def _detect_english_input(self, audio_data) -> Optional[str]:
         """Detect if audio contains English speech."""
@@ -159,7 +419,7 @@ class WrappedGrok:
         try:
             text = self.recognizer.recognize_google(audio_data, language='en-US')
             if text:
-                logger.info(f"Detected English input: {text}")
+                logger.info("Detected English input: %s", text)
                 return text
         except Exception as e:
             if self.audio_available and sr:
@@ -173,107 +433,242 @@ class WrappedGrok:
                 logger.warning(f"Audio detection error: {e}")
         return None
     
+    VAD_SAMPLE_RATE = 16000
+    VAD_FRAME_MS = 30
+    VAD_MIN_SPEECH_MS = 150  # Consecutive voiced audio needed to count as an interruption
+    VAD_END_SILENCE_MS = 300  # Trailing silence that confirms the user has finished
+    
+    @cached_property
+    def _vad(self):
+        """Better voice detection for interruptions, imported on first use (None = use RMS energy)."""
+        try:
+            import webrtcvad
+        except ImportError:
+            return None
+        return webrtcvad.Vad(2)
+    
+    def _frame_is_voiced(self, frame: bytes, energy_threshold: float) -> bool:
+        """One VAD_FRAME_MS frame of 16-bit PCM: webrtcvad when installed, otherwise RMS energy."""
+        if self._vad is not None:
+            return self._vad.is_speech(frame, self.VAD_SAMPLE_RATE)
+        samples = array('h', frame)
+        return math.sqrt(sum(x * x for x in samples) / len(samples)) > energy_threshold
+    
+    def _is_speech(self, audio, energy_threshold: float) -> bool:
+        """Cheap local voice check: at least VAD_MIN_SPEECH_MS of consecutive voiced frames."""
+        pcm = audio.get_raw_data(convert_rate=self.VAD_SAMPLE_RATE, convert_width=2)
+        frame_bytes = self.VAD_SAMPLE_RATE * self.VAD_FRAME_MS // 1000 * 2
+        needed = self.VAD_MIN_SPEECH_MS // self.VAD_FRAME_MS
+        voiced = 0
+        for start in range(0, len(pcm) - frame_bytes + 1, frame_bytes):
+            voiced = voiced + 1 if self._frame_is_voiced(pcm[start:start + frame_bytes], energy_threshold) else 0
+            if voiced >= needed:
+                return True
+        return False
+    
+    def _wait_for_end_of_speech(self, max_wait: float):
+        """
+        Block until VAD_END_SILENCE_MS of silence on the open microphone, or max_wait seconds
+        if the user keeps talking. Usually returns after ~300ms instead of a fixed sleep.
+        """
+        frame_samples = self.VAD_SAMPLE_RATE * self.VAD_FRAME_MS // 1000  # Microphone runs at 16 kHz, 16-bit
+        needed = self.VAD_END_SILENCE_MS // self.VAD_FRAME_MS
+        deadline = time.time() + max_wait
+        silent = 0
+        with self._mic_lock:
+            while silent < needed and time.time() < deadline:
+                frame = self.microphone.stream.read(frame_samples)
+                silent = 0 if self._frame_is_voiced(frame, self.recognizer.energy_threshold) else silent + 1
+    
     def _interruption_callback(self, recognizer, audio):
         """
         Callback function for background listener - called when audio is detected.
         This is the proper way to detect interruptions in speech_recognition.
+        
+        Longer speech interrupts on local voice detection alone; the transcript is only
+        needed for the violation log, so recognition runs afterwards on the thread pool.
+        Short bursts are transcribed first so backchannels ("yeah", "mhm") don't interrupt.
         """
         if not self.speaking or self.interrupt_speech:
             return  # Already interrupted or not speaking
         
+        duration = len(audio.frame_data) / (audio.sample_rate * audio.sample_width)
+        started_at = time.time() - duration
+        if 0 <= self._ignore_audio_until - started_at < self.ECHO_GUARD_SECONDS:
+            return  # Phrase started while a sentence was starting to play - likely its echo
+        
         try:
-            logger.info("🔊 Audio detected during speech - checking for interruption...")
-            # Try to recognize the audio
-            try:
-                english_text = recognizer.recognize_google(audio, language='en-US')
-                if english_text and len(english_text.strip()) > 0:
-                    self.interrupt_speech = True
-                    logger.info(f"🚨 INTERRUPTED by user: '{english_text}'")
-                    self._log_violation(f"Speech interrupted by user input: {english_text}")
-            except sr.UnknownValueError:
-                # Couldn't understand, but audio was detected - treat as interruption anyway
-                logger.info("🚨 INTERRUPTED: Audio detected (could not transcribe - treating as interruption)")
-                self.interrupt_speech = True
-                self._log_violation("Speech interrupted by audio detection (untranscribable)")
-            except sr.RequestError as e:
-                # Service error, but audio was detected - treat as interruption
-                logger.info(f"🚨 INTERRUPTED: Audio detected (recognition service error: {e})")
-                self.interrupt_speech = True
-                self._log_violation("Speech interrupted by audio detection (recognition error)")
+            if not self._is_speech(audio, recognizer.energy_threshold):
+                logger.debug("Audio during speech doesn't look like voice - ignoring")
+                return
+            if duration <= self.FILLER_CHECK_MAX_SECONDS:
+                self._pool.submit(self._interrupt_unless_filler, recognizer, audio)
+                return
+            logger.info("🚨 INTERRUPTED: voice detected during speech")
+            self._signal_interrupt()
+            self._pool.submit(self._log_interruption, recognizer, audio)
         except Exception as e:
             logger.warning(f"Interruption callback error: {e}")
             # Still treat as interruption if audio was detected
-            self.interrupt_speech = True
+            self._signal_interrupt()
+    
+    FILLER_CHECK_MAX_SECONDS = 0.8  # Voice bursts up to this long are checked for filler words
+    ECHO_GUARD_SECONDS = 0.3  # Interruption audio ignored right after speech starts
+    
+    def _interrupt_unless_filler(self, recognizer, audio):
+        """Transcribe a short burst of speech and interrupt unless it was only filler words."""
+        try:
+            english_text = recognizer.recognize_google(audio, language='en-US')
+        except sr.UnknownValueError:
+            logger.debug("Short untranscribable sound during speech - ignoring")
+            return
+        except sr.RequestError as e:
+            logger.debug("Recognition service error: %s", e)
+            english_text = None  # Can't tell - interrupt rather than talk over the user
+        
+        if english_text and _is_filler(english_text):
+            logger.debug("Backchannel during speech - ignoring: %s", english_text)
+            return
+        if not self.speaking or self.interrupt_speech:
+            return
+        self._signal_interrupt()
+        if english_text:
+            logger.info("🚨 INTERRUPTED by user: '%s'", english_text)
+            self._log_violation(f"Speech interrupted by user input: {english_text}")
+        else:
+            logger.info("🚨 INTERRUPTED: voice detected during speech")
+            self._log_violation("Speech interrupted by audio detection (recognition error)")
+    
+    def _log_interruption(self, recognizer, audio):
+        """Transcribe interrupting speech for the violation log."""
+        try:
+            english_text = recognizer.recognize_google(audio, language='en-US')
+            logger.info("🚨 INTERRUPTED by user: '%s'", english_text)
+            self._log_violation(f"Speech interrupted by user input: {english_text}")
+        except sr.UnknownValueError:
+            self._log_violation("Speech interrupted by audio detection (untranscribable)")
+        except sr.RequestError as e:
+            logger.debug("Recognition service error: %s", e)
+            self._log_violation("Speech interrupted by audio detection (recognition error)")
+    
+    def _signal_interrupt(self):
+        """Flag the current speech as interrupted and wake anything waiting on it."""
+        self.interrupt_speech = True
+        self._interrupt_event.set()
+        proc = self._tts_proc
+        if proc is not None and proc.poll() is None:
+            proc.kill()  # Silence our own say process now - the speech thread reaps it
+    
+    AMBIENT_RECALIBRATE_SECONDS = 300
+    RECALIBRATE_EVERY_LISTENS = 20
     
     def _start_interruption_detection(self):
         """
-        Start background listening for interruptions using listen_in_background.
-        This is the proper way to continuously listen while speaking.
+        Enable the interruption listener for the speech that's starting.
+        One listener thread lives for the whole session; speaking just switches it on and off.
         """
         if not self.audio_available or not self.speaking:
             return
         
         try:
-            logger.info("🎤 Starting background interruption detection...")
-            
-            # Use the existing recognizer and microphone, but adjust for sensitivity
-            interrupt_recognizer = sr.Recognizer()
-            interrupt_recognizer.energy_threshold = 2000  # More sensitive
-            interrupt_recognizer.pause_threshold = 0.3  # Shorter pause
-            interrupt_recognizer.dynamic_energy_threshold = True
+            # Only recalibrate if that was a while ago, so TTS doesn't wait on 200ms of sampling each time
+            if time.time() - self._ambient_calibrated_at > self.AMBIENT_RECALIBRATE_SECONDS:
+                self._calibrate(duration=0.2)
             
-            # Adjust for ambient noise quickly
-            with self.microphone as source:
-                interrupt_recognizer.adjust_for_ambient_noise(source, duration=0.2)
+            if self._interrupt_recognizer is None:
+                # Same microphone, more sensitive settings derived from the calibrated threshold
+                self._interrupt_recognizer = sr.Recognizer()
+                self._interrupt_recognizer.pause_threshold = 0.3  # Shorter pause
+                self._interrupt_recognizer.dynamic_energy_threshold = True
+                threading.Thread(target=self._interruption_listener_loop, daemon=True).start()
+            self._interrupt_recognizer.energy_threshold = self.recognizer.energy_threshold * 0.5
             
-            logger.info(f"🎤 Interruption detection ready (energy_threshold={interrupt_recognizer.energy_threshold})")
-            
-            # Start background listener with callback
-            # phrase_time_limit=1.0 means accept 1 second of speech as interruption
-            self.background_listener_stop = interrupt_recognizer.listen_in_background(
-                self.microphone,
-                self._interruption_callback,
-                phrase_time_limit=1.0  # Accept 1 second of speech as valid interruption
-            )
-            logger.info("✅ Background interruption listener started")
+            self._listen_enabled.set()
+            logger.info(f"🎤 Interruption detection on (energy_threshold={self._interrupt_recognizer.energy_threshold})")
             
         except Exception as e:
             logger.error(f"❌ Failed to start interruption detection: {e}")
             # Continue anyway - TTS will still check self.interrupt_speech flag
     
+    def _calibrate(self, duration: float):
+        """Measure ambient noise on the open microphone stream to set the energy threshold."""
+        with self._mic_lock:
+            self.recognizer.adjust_for_ambient_noise(self.microphone, duration=duration)
+        self._ambient_calibrated_at = time.time()
+        self._listens_since_calibration = 0
+    
+    def _interruption_listener_loop(self):
+        """
+        Long-lived interruption listener. Sleeps until _listen_enabled is set, then reads the
+        shared microphone (holding _mic_lock) until it's cleared, so the main listen can have it back.
+        """
+        recognizer = self._interrupt_recognizer
+        while True:
+            self._listen_enabled.wait()
+            if self._listener_closed:
+                return
+            with self._mic_lock:
+                while self._listen_enabled.is_set() and not self._listener_closed:
+                    try:
+                        # phrase_time_limit=1.0 means accept 1 second of speech as interruption
+                        audio = recognizer.listen(self.microphone, 1, phrase_time_limit=1.0)
+                    except sr.WaitTimeoutError:
+                        continue
+                    except Exception as e:
+                        logger.warning(f"Interruption listener error: {e}")
+                        continue
+                    if self._listen_enabled.is_set():
+                        self._interruption_callback(recognizer, audio)
+    
+    def _stop_background_listener(self, quiet: bool = False):
+        """Switch the interruption listener off. Safe to call from any thread, any number of times."""
+        if self._listen_enabled.is_set():
+            self._listen_enabled.clear()
+            if not quiet:
+                logger.info("✅ Stopped background interruption listener")
+    
     def _wait_for_silence(self) -> bool:
         """
         Wait for silence timeout before processing/responding.
         Returns True if silence detected, False if interrupted.
         """
-        logger.debug(f"Waiting {self.silence_timeout}s for silence...")
-        start_time = time.time()
-        while time.time() - start_time < self.silence_timeout:
-            if self.interrupt_speech:
-                logger.info("Silence wait interrupted")
-                return False
-            time.sleep(0.1)
+        logger.debug("Waiting %ss for silence...", self.silence_timeout)
+        # Blocks without polling - returns as soon as an interruption is signalled
+        if self._interrupt_event.wait(self.silence_timeout):
+            logger.info("Silence wait interrupted")
+            return False
         
         logger.debug("Silence timeout reached")
         return True
     
+    SEARCH_CONTEXT_MAX_CHARS = 800
+    SEARCH_CONTEXT_MIN_CHARS = 40  # Organic snippets shorter than this aren't worth sending Grok
+    
     def _search_web(self, query: str) -> Optional[str]:
         """Search web using SerpAPI for factual claims. Returns comprehensive context."""
-        if GoogleSearch is None:
-            logger.warning("SerpAPI not available. Web search disabled.")
-            self._log_violation("Web search attempted but SerpAPI not installed")
-            return None
+        cache_key = _normalize_query(query)
+        with self._cache_lock:
+            cached = self._serp_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Web search cache hit")
+            return cached or None  # "" = searched recently, nothing useful
         
         try:
-            search = GoogleSearch({
+            # SerpAPI's JSON endpoint over the pooled session (what GoogleSearch.get_dict() calls)
+            response = self._serp_http.get(self.serpapi_url, params={
+                "engine": "google",
                 "q": query,
                 "api_key": self.serpapi_key,
-                "num": 3  # Get top 3 results for richer context
-            })
-            results = search.get_dict()
+                "num": 3,  # Get top 3 results for richer context
+                "no_cache": "false",  # Let SerpAPI answer from its own cache when it can
+                "hl": "en",  # Stable, English snippets
+            }, timeout=10)
+            response.raise_for_status()
+            results = orjson.loads(response.content)
             
             # Combine top results for better context
             context_parts = []
+            seen = set()  # Google often returns near-identical snippets - skip repeats
             
             # Check for answer box or knowledge graph (direct answers)
             if "answer_box" in results and results["answer_box"]:
@@ -281,22 +676,29 @@ class WrappedGrok:
                 if answer:
                     logger.info("Web search found direct answer box")
                     context_parts.append(f"Direct answer: {answer}")
+                    seen.add(_snippet_fingerprint(answer))
             
-            # Extract top 3 organic results for comprehensive context
-            if "organic_results" in results and len(results["organic_results"]) > 0:
-                for i, result in enumerate(results["organic_results"][:3]):
-                    title = result.get("title", "")
-                    snippet = result.get("snippet", "")
-                    if snippet:
-                        context_parts.append(f"{title}: {snippet}")
-                
-                if context_parts:
-                    # Combine multiple results for richer context
-                    combined_context = " | ".join(context_parts)
-                    logger.info(f"Web search provided {len(results['organic_results'][:3])} results ({len(combined_context)} chars)")
-                    return combined_context
+            # Extract top 3 organic results for comprehensive context (the answer box is always kept)
+            for result in results.get("organic_results", [])[:3]:
+                snippet = result.get("snippet", "")
+                if len(snippet) < self.SEARCH_CONTEXT_MIN_CHARS:
+                    continue
+                fingerprint = _snippet_fingerprint(snippet)
+                if fingerprint not in seen:
+                    seen.add(fingerprint)
+                    context_parts.append(f"{result.get('title', '')}: {snippet}")
+            
+            # Cap the context - every character is Grok input tokens
+            combined_context = " | ".join(context_parts)[:self.SEARCH_CONTEXT_MAX_CHARS]
+            if combined_context:
+                logger.info("Web search provided %d results (%d chars)", len(context_parts), len(combined_context))
+                with self._cache_lock:
+                    self._serp_cache[cache_key] = combined_context
+                return combined_context
             
-            logger.warning(f"No search results for: {query}")
+            logger.warning("No search results for: %s", query)
+            with self._cache_lock:
+                self._serp_cache[cache_key] = ""  # Don't repeat a search that came back empty
             return None
         except Exception as e:
             logger.error(f"SerpAPI search error: {e}")
@@ -305,24 +707,119 @@ class WrappedGrok:
     
     def _extract_factual_claims(self, text: str) -> List[str]:
         """Extract potential factual claims from text."""
-        # Simple pattern matching for factual claims
-        # Look for statements that might need verification
-        patterns = [
-            r'\b\d{4}\b',  # Years
-            r'\b(is|was|are|were)\s+\w+',  # "is/was" statements
-            r'\b(according to|studies show|research indicates)',
-            r'\b(percent|percentage|\%)',
-        ]
-        
-        claims = []
-        sentences = re.split(r'[.!?]+', text)
-        for sentence in sentences:
-            for pattern in patterns:
-                if re.search(pattern, sentence, re.IGNORECASE):
-                    claims.append(sentence.strip())
-                    break
+        with self._cache_lock:
+            cached = self._claim_cache.get(text)
+        if cached is not None:
+            return list(cached)
+        
+        # Most turns have no claim at all - one scan of the whole text settles that without splitting
+        if _CLAIM_RE.search(text) is None:
+            claims = []
+        else:
+            claims = [sentence.strip() for sentence in _SENTENCE_SPLIT_RE.split(text) if _CLAIM_RE.search(sentence)]
         
-        return claims
+        with self._cache_lock:
+            self._claim_cache[text] = claims
+        return list(claims)
+    
+    def _build_messages(self, user_input: str, context: Optional[str] = None) -> List[Dict]:
+        """Build the chat messages (system prompt + optional web context + user input)."""
+        # Format context clearly so model can use it effectively (clear separation helps)
+        if context:
+            system_msg = {"role": "system", "content": SYSTEM_PROMPT + _CONTEXT_TEMPLATE.format(context=context)}
+        else:
+            system_msg = _BASE_SYSTEM_MSG  # Shared, never mutated - only serialized into the request
+        return [system_msg, {"role": "user", "content": user_input}]
+    
+    # Common Grok model names, in order of preference (grok-3 is the current model)
+    MODEL_NAMES = ("grok-3", "grok-beta", "grok-2", "grok-vision-beta", "grok")
+    
+    @staticmethod
+    def _is_model_error(response: requests.Response) -> bool:
+        """True for a 400 that means "this model isn't available" (rather than a key/request error)."""
+        if response.status_code != 400:
+            return False
+        error_text = response.text.lower()
+        return "model" in error_text and ("invalid" in error_text or "not found" in error_text)
+    
+    # Sampling parameters shared by every Grok request
+    GENERATION_PARAMS = {
+        "temperature": 0.7,  # Balanced - good for factual, thoughtful answers (was 0.8)
+        "max_tokens": 2000,  # Increased significantly for comprehensive, detailed answers (was 1000)
+        "top_p": 0.9,  # Balanced nucleus sampling for quality (was 0.95)
+        "frequency_penalty": 0.0,  # Don't penalize repetition (allows better explanations)
+        "presence_penalty": 0.0,  # Don't penalize new topics
+    }
+    
+    def _payload(self, model_name: str, messages: List[Dict], stream: bool = False) -> bytes:
+        """Request body serialized with orjson (Content-Type is set on the session)."""
+        payload = {"model": model_name, "messages": messages, **self.GENERATION_PARAMS}
+        if stream:
+            payload["stream"] = True
+        return orjson.dumps(payload)
+    
+    def _post_one_model(self, model_name: str, messages: List[Dict]) -> requests.Response:
+        return self._http.post(self.grok_api_url, data=self._payload(model_name, messages), timeout=30)
+    
+    def _post_models(self, messages: List[Dict]) -> Optional[requests.Response]:
+        """
+        POST to the model that worked last time. Until one is known (or if it stops
+        working), try every model name at once and keep the first 200 - the worst case
+        is one round trip instead of one per model. Returns the successful response,
+        or the most informative failed one.
+        """
+        if self._preferred_model:
+            response = self._post_one_model(self._preferred_model, messages)
+            if not self._is_model_error(response):
+                return response
+            logger.info(f"Model {self._preferred_model} no longer available, trying all models")
+            self._preferred_model = None
+        
+        # Own short-lived executor: this can run on a self._pool worker, and waiting on
+        # more self._pool tasks from there could starve the pool
+        executor = ThreadPoolExecutor(max_workers=len(self.MODEL_NAMES))
+        futures = {executor.submit(self._post_one_model, m, messages): m for m in self.MODEL_NAMES}
+        failed = None
+        error = None
+        try:
+            for future in as_completed(futures):
+                try:
+                    response = future.result()
+                except requests.exceptions.RequestException as e:
+                    error = e
+                    continue
+                if response.status_code == 200:
+                    self._preferred_model = futures[future]
+                    logger.info(f"Successfully using model: {self._preferred_model}")
+                    return response
+                # Prefer reporting a key/request error over "model not found"
+                if failed is None or self._is_model_error(failed):
+                    failed = response
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        if failed is None and error is not None:
+            raise error
+        return failed
+    
+    # Greetings and acknowledgements answered locally - no search, no Grok round trip
+    PHATIC_REPLIES = {
+        "hi": "Hi there.",
+        "hey": "Hey!",
+        "hello": "Hello!",
+        "thanks": "You're welcome.",
+        "thank you": "You're welcome.",
+        "ok": "Okay.",
+        "okay": "Okay.",
+        "good morning": "Good morning!",
+        "good night": "Good night!",
+    }
+    
+    def _phatic_reply(self, user_input: str) -> Optional[str]:
+        """Canned reply for a short greeting/acknowledgement (3 words or fewer, no claims), else None."""
+        if len(user_input.split(None, 3)) > 3 or _CLAIM_RE.search(user_input):
+            return None
+        return self.PHATIC_REPLIES.get(_NON_WORD_RE.sub(" ", user_input.lower()).strip())
     
     def _query_grok(self, user_input: str, context: Optional[str] = None) -> str:
         """Query Grok API using requests."""
@@ -333,87 +830,29 @@ class WrappedGrok:
             self._log_violation("Grok API key not configured")
             return error_msg
         
+        reply = self._phatic_reply(user_input)
+        if reply is not None:
+            return reply
+        
+        cached, query = self._cached_response(user_input, context)
+        if cached is not None:
+            return cached
+        
         try:
-            messages = []
-            # Enhanced system prompt optimized for high-quality, informative answers (matches web app quality)
-            system_prompt = """You are Grok, an advanced AI assistant created by xAI. 
-Your goal is to provide accurate, insightful, and helpful answers that demonstrate deep understanding.
-
-Quality guidelines:
-- Provide detailed, well-reasoned answers that show you understand the topic thoroughly
-- When web search context is provided, use it to give current, factual, and accurate information
-- Be thorough but clear - explain concepts with relevant details and context
-- If asked to explain something, provide comprehensive information with examples when helpful
-- Be conversational, natural, and engaging - write like you're helping a friend understand
-- If uncertain about something, acknowledge it rather than speculating
-- When using information from web search, synthesize it naturally into a coherent answer
-- Prioritize accuracy, helpfulness, and completeness
-- Think through your answers before responding to ensure quality"""
-            
-            # Build context-rich messages - format web search context clearly
-            if context:
-                # Format context clearly so model can use it effectively (clear separation helps)
-                messages.append({
-                    "role": "system",
-                    "content": system_prompt + f"\n\n=== Current Web Search Context (use this to inform your answer) ===\n{context}\n=== End of Web Search Context ===\n\nUse this context to provide an accurate, detailed, and helpful answer. Synthesize the information naturally into your response."
-                })
-            else:
-                messages.append({
-                    "role": "system",
-                    "content": system_prompt
-                })
+            messages = self._build_messages(user_input, context)
             
-            messages.append({
-                "role": "user",
-                "content": user_input
-            })
+            logger.debug("Sending to Grok: %d messages, context: %s", len(messages), bool(context))
             
-            logger.debug(f"Sending to Grok: {len(messages)} messages, context: {bool(context)}")
+            logger.debug("Querying Grok API at %s with %d messages", self.grok_api_url, len(messages))
             
-            headers = {
-                "Authorization": f"Bearer {self.grok_api_key}",
-                "Content-Type": "application/json"
-            }
+            response = self._post_models(messages)
+            last_response = response
             
-            logger.debug(f"Querying Grok API at {self.grok_api_url} with {len(messages)} messages")
-            
-            # Try common Grok model names (grok-3 is the current model)
-            model_names = ["grok-3", "grok-beta", "grok-2", "grok-vision-beta", "grok"]
-            last_response = None
-            
-            for model_name in model_names:
-                payload = {
-                    "model": model_name,
-                    "messages": messages,
-                    "temperature": 0.7,  # Balanced - good for factual, thoughtful answers (was 0.8)
-                    "max_tokens": 2000,  # Increased significantly for comprehensive, detailed answers (was 1000)
-                    "top_p": 0.9,  # Balanced nucleus sampling for quality (was 0.95)
-                    "frequency_penalty": 0.0,  # Don't penalize repetition (allows better explanations)
-                    "presence_penalty": 0.0,  # Don't penalize new topics
-                }
-                
-                response = requests.post(
-                    self.grok_api_url,
-                    headers=headers,
-                    json=payload,
-                    timeout=30
-                )
-                last_response = response
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    logger.info(f"Successfully using model: {model_name}")
-                    return result["choices"][0]["message"]["content"]
-                elif response.status_code == 400:
-                    # Check if it's a model error or API key error
-                    error_text = response.text.lower()
-                    if "model" in error_text and ("invalid" in error_text or "not found" in error_text):
-                        # Try next model
-                        logger.debug(f"Model {model_name} not available, trying next...")
-                        continue
-                    else:
-                        # Likely API key error or other issue
-                        break
+            if response is not None and response.status_code == 200:
+                result = orjson.loads(response.content)
+                answer = result["choices"][0]["message"]["content"]
+                self._store_response(user_input, context, answer, query)
+                return answer
             
             # If we get here, all models failed or it's an API key issue
             if last_response:
@@ -466,6 +905,132 @@ Quality guidelines:
             self._log_violation(f"Grok API unexpected error: {type(e).__name__}: {str(e)}")
             return error_msg
     
+    def _query_grok_stream(self, user_input: str, context: Optional[str] = None) -> Iterator[str]:
+        """Query Grok with streaming enabled and yield content deltas as they arrive."""
+        reply = self._phatic_reply(user_input)
+        if reply is not None:
+            yield reply
+            return
+        
+        cached, query = self._cached_response(user_input, context)
+        if cached is not None:
+            yield cached
+            return
+        
+        messages = self._build_messages(user_input, context)
+        # Known-good model first; streaming tries them in order
+        preferred = self._preferred_model
+        model_names = ([preferred] if preferred else []) + [m for m in self.MODEL_NAMES if m != preferred]
+        streamed = False
+        
+        try:
+            for model_name in model_names:
+                with self._http.post(
+                    self.grok_api_url,
+                    data=self._payload(model_name, messages, stream=True),
+                    timeout=30,
+                    stream=True
+                ) as response:
+                    if self._is_model_error(response):
+                        logger.debug("Model %s not available, trying next...", model_name)
+                        continue
+                    if response.status_code != 200:
+                        break
+                    
+                    logger.info("Streaming from model: %s", model_name)
+                    self._preferred_model = model_name
+                    parts = []
+                    # Server-sent events: "data: {json}" lines, terminated by "data: [DONE]"
+                    for line in response.iter_lines(decode_unicode=True):
+                        if not line or not line.startswith("data: "):
+                            continue
+                        data = line[len("data: "):]
+                        if data == "[DONE]":
+                            break
+                        delta = orjson.loads(data)["choices"][0].get("delta", {}).get("content")
+                        if delta:
+                            streamed = True
+                            parts.append(delta)
+                            yield delta
+                    self._store_response(user_input, context, "".join(parts), query)
+                    return
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Grok streaming request error: {e}")
+            self._log_violation(f"Grok streaming error: {str(e)}")
+            if streamed:
+                # Part of the answer was already sent - don't repeat it
+                return
+        
+        # Streaming failed - the non-streaming path produces the detailed error message
+        yield self._query_grok(user_input, context)
+    
+    FIRST_CLAUSE_MIN_CHARS = 40  # Shortest opening clause worth speaking on its own
+    
+    def _stream_sentences(self, chunks: Iterable[str]) -> Iterator[str]:
+        """
+        Regroup streamed text chunks into whole sentences, yielding each as soon as it ends.
+        
+        Later sentences are synthesized while earlier ones play, but nothing hides the first
+        one - if it runs long, its first clause is yielded on its own so speech starts sooner.
+        """
+        buffer = ""
+        started = False
+        for chunk in chunks:
+            buffer += chunk
+            *complete, buffer = _SENTENCE_END_RE.split(buffer)
+            for sentence in complete:
+                if sentence.strip():
+                    started = True
+                    yield sentence.strip()
+            if not started and len(buffer) > self.FIRST_CLAUSE_MIN_CHARS:
+                brk = _CLAUSE_END_RE.search(buffer, self.FIRST_CLAUSE_MIN_CHARS)
+                if brk:
+                    started = True
+                    clause, buffer = buffer[:brk.start()], buffer[brk.end():]
+                    yield clause.strip()
+        if buffer.strip():
+            yield buffer.strip()
+    
+    def _prefetch(self, items: Iterable, maxsize: int = 0) -> Iterator:
+        """
+        Read an iterator on the thread pool and hand items over through a queue, so the
+        Grok stream keeps downloading while earlier sentences are being spoken.
+        maxsize bounds how far the reader runs ahead. Stops reading once speech is
+        interrupted or the consumer goes away.
+        """
+        done = object()
+        handoff: Queue = Queue(maxsize=maxsize)
+        stopped = threading.Event()
+        
+        def put(item) -> bool:
+            while not (stopped.is_set() or self._interrupt_event.is_set()):
+                try:
+                    handoff.put(item, timeout=0.1)
+                    return True
+                except Full:
+                    pass
+            return False
+        
+        def pump():
+            try:
+                for item in items:
+                    if not put(item):
+                        break
+            except Exception as e:
+                logger.error(f"Response stream error: {e}")
+            finally:
+                put(done)
+        
+        self._pool.submit(pump)
+        try:
+            while True:
+                item = handoff.get()
+                if item is done:
+                    return
+                yield item
+        finally:
+            stopped.set()
+    
     def _limit_response_length(self, response: str, user_input: str) -> str:
         """Limit response to max words unless 'explain' keyword present."""
         user_input_lower = user_input.lower()
@@ -475,230 +1040,401 @@ Quality guidelines:
             logger.info(f"'explain' keyword detected, allowing full response")
             return response
         
-        # Smart truncation: Try to end at sentence boundary instead of mid-word
+        # Smart truncation: one split, then a single join of the words that are kept
         words = response.split()
-        if len(words) > self.max_response_words:
-            # Try to truncate at sentence boundary (period, exclamation, question mark)
-            truncated_words = words[:self.max_response_words]
-            truncated = ' '.join(truncated_words)
-            
-            # Check if we're cutting mid-sentence - if so, look for punctuation before truncation point
-            original_truncated = truncated
-            for i in range(min(self.max_response_words, len(words)) - 1, max(0, self.max_response_words - 5), -1):
-                if words[i][-1] in '.!?':
-                    truncated = ' '.join(words[:i+1])
-                    logger.info(f"Truncated at sentence boundary: {i+1} words")
+        if len(words) <= self.max_response_words:
+            return response
+        
+        # End at a sentence boundary among the last few allowed words if there is one
+        limit = self.max_response_words
+        kept = limit
+        for i in range(limit - 1, max(0, limit - 5), -1):
+            if words[i][-1] in '.!?':
+                kept = i + 1
+                logger.info("Truncated at sentence boundary: %d words", kept)
+                break
+        truncated = ' '.join(words[:kept])
+        
+        logger.info("Truncated response from %d to %d words", len(words), kept)
+        self._log_violation(f"Response truncated: {len(words)} words -> {kept} words")
+        return truncated
+    
+    TTS_MODEL = "eleven_monolingual_v1"
+    TTS_CACHE_MAX_BYTES = 100 * 1024 * 1024
+    
+    def _synthesize(self, text: str) -> bytes:
+        """ElevenLabs audio for text, from the memory or disk cache when this exact phrase was spoken before."""
+        key = hashlib.sha1(f"{text}|{self.elevenlabs_voice_id}|{self.TTS_MODEL}".encode()).hexdigest()
+        with self._cache_lock:
+            audio = self._tts_hot_cache.get(key)
+        if audio is not None:
+            return audio
+        
+        path = self._tts_cache_dir / f"{key}.mp3" if self._tts_cache_dir else None
+        if path and path.exists():
+            audio = path.read_bytes()
+            os.utime(path)  # mtime doubles as "last used" for eviction
+        else:
+            audio = self.elevenlabs_generate(
+                text=text,
+                voice=self.elevenlabs_voice_id,
+                model=self.TTS_MODEL
+            )
+            if not isinstance(audio, bytes):
+                audio = b"".join(audio)  # Streaming clients return an iterator of chunks
+            if path:
+                # Write then rename, so a concurrent reader never sees a partial file
+                tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+                tmp.write_bytes(audio)
+                os.replace(tmp, path)
+                self._pool.submit(self._evict_tts_cache)
+        
+        with self._cache_lock:
+            self._tts_hot_cache[key] = audio
+        return audio
+    
+    def _evict_tts_cache(self):
+        """Delete least recently used audio files once the disk cache exceeds TTS_CACHE_MAX_BYTES."""
+        try:
+            files = [(f.stat(), f) for f in self._tts_cache_dir.glob("*.mp3")]
+            total = sum(st.st_size for st, _ in files)
+            for st, f in sorted(files, key=lambda item: item[0].st_mtime):
+                if total <= self.TTS_CACHE_MAX_BYTES:
                     break
-            
-            # If still too long or no sentence boundary found, use original truncation
-            if len(truncated.split()) > self.max_response_words:
-                truncated = original_truncated
-                # Add ellipsis if cut mid-sentence
-                if truncated[-1] not in '.!?':
-                    truncated += '...'
-            
-            logger.info(f"Truncated response from {len(words)} to {len(truncated.split())} words")
-            self._log_violation(f"Response truncated: {len(words)} words -> {len(truncated.split())} words")
-            return truncated
+                f.unlink(missing_ok=True)
+                total -= st.st_size
+        except OSError as e:
+            logger.debug(f"TTS cache eviction error: {e}")
+    
+    def _say_cache_path(self, text: str) -> Optional[Path]:
+        """Where the say rendering of a fixed phrase lives, or None without a disk cache."""
+        if not self._say_cache_enabled:
+            return None
+        return self._tts_cache_dir / f"{hashlib.sha1(f'{text}|say'.encode()).hexdigest()}.aiff"
+    
+    def _warm_say_cache(self):
+        """Render the phrases that are spoken over and over (goodbye, canned replies) with say -o."""
+        for text in {"Goodbye!", *self.PHATIC_REPLIES.values()}:
+            path = self._say_cache_path(text)
+            if path.exists():
+                continue
+            tmp = path.with_suffix(f".{threading.get_ident()}.aiff")  # say picks the format from the extension
+            try:
+                subprocess.run(['say', '-o', str(tmp), text],
+                               check=True, timeout=10,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                os.replace(tmp, path)
+            except (OSError, subprocess.SubprocessError) as e:
+                logger.debug(f"Couldn't pre-render '{text}': {e}")
+                return
+    
+    # say speaks ~175 words/min (~15 chars/s); the bound is generous so only a hung process hits it
+    TTS_MIN_WAIT_SECONDS = 5.0
+    TTS_SECONDS_PER_CHAR = 0.15
+    
+    def _speak_one(self, text: str, audio_future: Optional[Future] = None):
+        """
+        Synthesize and play one piece of text (runs on the speech thread).
+        audio_future is ElevenLabs audio already being synthesized for text, if any.
+        """
+        logger.info("Response: %s", text)
+        # Use ElevenLabs if available, otherwise fall back to system say
+        if self.use_elevenlabs and self.elevenlabs_available:
+            try:
+                logger.info(f"🔊 Speaking with ElevenLabs (voice: {self.elevenlabs_voice_id})...")
+                # Generate audio with ElevenLabs in the background so we can check for interruption
+                if audio_future is None:
+                    audio_future = self._pool.submit(self._synthesize, text)
+                
+                # Wait for audio generation with interruption check
+                audio_data = None
+                while audio_data is None:
+                    try:
+                        audio_data = audio_future.result(timeout=0.05)
+                    except FutureTimeoutError:
+                        if self._interrupt_event.is_set():
+                            logger.info("🚨 Speech interrupted during ElevenLabs generation")
+                            break
+                
+                if not self.interrupt_speech and audio_data:
+                    # Play audio using ElevenLabs play (plays through speakers)
+                    # Note: This is less interruptible, but sounds much better
+                    logger.info("🎵 Playing ElevenLabs audio...")
+                    self._start_echo_guard()
+                    self.elevenlabs_play(audio_data)
+                    
+                    if self.interrupt_speech:
+                        logger.info("🚨 ElevenLabs TTS was interrupted")
+            except Exception as e:
+                logger.error(f"❌ ElevenLabs TTS error: {e}")
+                logger.info("ℹ️  Falling back to system TTS")
+                # Fall through to system TTS
+                self.use_elevenlabs = False
         
-        return response
+        # System TTS (fallback or if ElevenLabs not used)
+        if not self.use_elevenlabs or not self.elevenlabs_available:
+            logger.info("🔊 Speaking with system TTS (say command)...")
+            try:
+                cached = self._say_cache_path(text)
+                if cached is not None and cached.exists():
+                    # Pre-rendered phrase - just play the file
+                    proc = subprocess.Popen(['afplay', str(cached)],
+                                            stdout=subprocess.DEVNULL,
+                                            stderr=subprocess.DEVNULL)
+                    self._tts_proc = proc
+                else:
+                    # One say process per utterance, text on stdin - no per-chunk process spawns
+                    proc = subprocess.Popen(['say'],
+                                            stdin=subprocess.PIPE,
+                                            stdout=subprocess.DEVNULL,
+                                            stderr=subprocess.DEVNULL)
+                    self._tts_proc = proc  # So an interruption can kill it directly
+                    proc.stdin.write(text.encode())
+                    proc.stdin.close()
+                self._start_echo_guard()
+                
+                # No polling: _signal_interrupt() kills the registered process, which ends this wait.
+                # Only an interruption that landed before the process was registered needs handling here.
+                if self._interrupt_event.is_set():
+                    logger.info("🚨 Speech interrupted, stopping TTS immediately")
+                    self._stop_process(proc)
+                try:
+                    proc.wait(timeout=self.TTS_MIN_WAIT_SECONDS + self.TTS_SECONDS_PER_CHAR * len(text))
+                except subprocess.TimeoutExpired:
+                    logger.warning("⚠️  TTS process didn't finish in time, stopping it")
+                    self._stop_process(proc)
+            except Exception as e:
+                logger.debug("TTS error: %s", e)
+            finally:
+                self._tts_proc = None
+    
+    def _start_echo_guard(self):
+        """Call as each sentence starts playing: the mic hears the first moments of our own playback."""
+        self._ignore_audio_until = time.time() + self.ECHO_GUARD_SECONDS
+    
+    @staticmethod
+    def _stop_process(proc: subprocess.Popen):
+        """SIGTERM a process, then SIGKILL if it hasn't exited shortly after."""
+        proc.terminate()
+        try:
+            proc.wait(timeout=0.5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
     
-    def _speak_text(self, text: str, callback: Optional[Callable] = None):
-        """Speak text using TTS, interruptible by English input."""
+    def _speak_text(self, text: Union[str, Iterable[str]], callback: Optional[Callable] = None):
+        """
+        Speak text using TTS, interruptible by English input.
+        text may also be an iterable of sentences; each is spoken as soon as it arrives.
+        """
         self.speaking = True
         self.interrupt_speech = False
+        self._interrupt_event.clear()
+        sentences = [text] if isinstance(text, str) else text
         
         def speak():
+            items = None
             try:
-                # Start background interruption detection (uses listen_in_background)
+                # Switch on background interruption detection
                 self._start_interruption_detection()
                 
-                # Wait a moment for background listener to start
-                time.sleep(0.2)
-                
-                # Use ElevenLabs if available, otherwise fall back to system say
                 if self.use_elevenlabs and self.elevenlabs_available:
-                    try:
-                        logger.info(f"🔊 Speaking with ElevenLabs (voice: {self.elevenlabs_voice_id})...")
-                        # Generate audio with ElevenLabs in a thread so we can check for interruption
-                        audio_generated = threading.Event()
-                        audio_data = None
-                        audio_error = None
-                        
-                        def generate_audio():
-                            nonlocal audio_data, audio_error
-                            try:
-                                audio_data = self.elevenlabs_generate(
-                                    text=text,
-                                    voice=self.elevenlabs_voice_id,
-                                    model="eleven_monolingual_v1"
-                                )
-                                audio_generated.set()
-                            except Exception as e:
-                                audio_error = e
-                                audio_generated.set()
-                        
-                        # Generate audio in background
-                        gen_thread = threading.Thread(target=generate_audio, daemon=True)
-                        gen_thread.start()
-                        
-                        # Wait for audio generation with interruption check
-                        while not audio_generated.is_set():
-                            if self.interrupt_speech:
-                                logger.info("🚨 Speech interrupted during ElevenLabs generation")
-                                break
-                            time.sleep(0.1)
-                        
-                        if audio_error:
-                            raise audio_error
-                        
-                        if not self.interrupt_speech and audio_data:
-                            # Play audio using ElevenLabs play (plays through speakers)
-                            # Note: This is less interruptible, but sounds much better
-                            logger.info("🎵 Playing ElevenLabs audio...")
-                            self.elevenlabs_play(audio_data)
-                            
-                            if self.interrupt_speech:
-                                logger.info("🚨 ElevenLabs TTS was interrupted")
-                    except Exception as e:
-                        logger.error(f"❌ ElevenLabs TTS error: {e}")
-                        logger.info("ℹ️  Falling back to system TTS")
-                        # Fall through to system TTS
-                        self.use_elevenlabs = False
-                
-                # System TTS (fallback or if ElevenLabs not used)
-                if not self.use_elevenlabs or not self.elevenlabs_available:
-                    logger.info("🔊 Speaking with system TTS (say command)...")
-                    words = text.split()
-                    chunk_size = 5  # Speak in small chunks for interruption
-                    
-                    for i in range(0, len(words), chunk_size):
-                        # Check for interruption before speaking each chunk
-                        if self.interrupt_speech:
-                            logger.info("🚨 Speech interrupted, stopping TTS immediately")
-                            # Kill all say processes immediately
-                            try:
-                                subprocess.run(['pkill', '-9', 'say'], check=False, timeout=0.5)
-                                subprocess.run(['killall', '-9', 'say'], check=False, timeout=0.5)
-                            except:
-                                pass
-                            break
-                        
-                        chunk = ' '.join(words[i:i+chunk_size])
-                        try:
-                            # Start say process
-                            proc = subprocess.Popen(['say', chunk], 
-                                                  stdout=subprocess.DEVNULL, 
-                                                  stderr=subprocess.DEVNULL)
-                            
-                            # Check periodically while speaking this chunk
-                            chunk_start = time.time()
-                            while proc.poll() is None:  # Process still running
-                                if self.interrupt_speech:
-                                    logger.info("🚨 Interruption detected during chunk, killing say process")
-                                    proc.kill()
-                                    subprocess.run(['pkill', '-9', 'say'], check=False, timeout=0.5)
-                                    break
-                                if time.time() - chunk_start > 3:  # Safety timeout
-                                    proc.kill()
-                                    break
-                                time.sleep(0.1)  # Check every 100ms
-                            
-                            # Wait for process to finish if not interrupted
-                            if not self.interrupt_speech:
-                                proc.wait(timeout=1)
-                        except subprocess.TimeoutExpired:
-                            subprocess.run(['pkill', '-9', 'say'], check=False)
-                        except Exception as e:
-                            logger.debug(f"TTS chunk error: {e}")
-                        
-                        if self.interrupt_speech:
-                            break
-                
-                self.speaking = False
-                
-                # Stop background listener
-                if self.background_listener_stop:
-                    try:
-                        self.background_listener_stop(wait_for_stop=False)
-                        logger.info("✅ Stopped background interruption listener")
-                    except Exception as e:
-                        logger.debug(f"Error stopping background listener: {e}")
-                    self.background_listener_stop = None
+                    # Pipeline: synthesize upcoming sentences while the current one plays
+                    items = self._prefetch(
+                        ((sentence, self._pool.submit(self._synthesize, sentence)) for sentence in sentences),
+                        maxsize=2,
+                    )
+                else:
+                    items = ((sentence, None) for sentence in sentences)
                 
-                if callback:
-                    callback()
+                for sentence, audio_future in items:
+                    if self.interrupt_speech:
+                        break
+                    self._speak_one(sentence, audio_future)
             except Exception as e:
                 logger.error(f"TTS error: {e}")
+            finally:
+                if items is not None:
+                    items.close()  # Stops the synthesis pipeline if we broke out early
                 self.speaking = False
-                
-                # Stop background listener on error
-                if self.background_listener_stop:
-                    try:
-                        self.background_listener_stop(wait_for_stop=False)
-                    except:
-                        pass
-                    self.background_listener_stop = None
-                
+                self._stop_background_listener()
                 if callback:
-                    callback()
+                    try:
+                        callback()
+                    except Exception as e:
+                        logger.debug(f"Speech callback error: {e}")
         
-        self.speech_thread = threading.Thread(target=speak, daemon=True)
-        self.speech_thread.start()
+        self.speech_future = self._speech_pool.submit(speak)
+    
+    MAX_VIOLATIONS = 1000
     
     def _log_violation(self, message: str):
         """Log a violation."""
-        violation = {
-            'timestamp': time.time(),
-            'message': message
-        }
-        self.violations.append(violation)
-        logger.warning(f"VIOLATION: {message}")
+        self.violations.append((time.time(), message))
+        logger.warning("VIOLATION: %s", message)
     
-    def process_input(self, user_input: str) -> str:
-        """
-        Main method to process user input with all constraints.
-        
-        Args:
-            user_input: User's text input
-            
-        Returns:
-            Response string
-        """
-        # Step 1: Wait for silence detection
-        if not self._wait_for_silence():
-            self._log_violation("Response generated without silence timeout")
-            return "Interrupted"
+    def _get_search_context(self, user_input: str) -> Optional[str]:
+        """Search the web for the first factual claim (or the whole input) and return context."""
+        if _is_small_talk(user_input):
+            logger.info("Small talk - skipping web search")
+            return None
         
-        # Step 2: Extract factual claims and search web for better context
         claims = self._extract_factual_claims(user_input)
         search_context = None
         
         # Always search web for better context - helps improve answer quality significantly
         if claims:
-            logger.info(f"Found {len(claims)} potential factual claims")
+            logger.info("Found %d potential factual claims", len(claims))
             # Search for first claim with more detail
-            search_query = claims[0][:150]  # Longer query for better search results
+            search_query = _clip_query(claims[0])  # Longer query for better search results
             search_context = self._search_web(search_query)
         else:
             # Search for general context - helps even for non-factual questions
-            search_query = user_input[:150]
-            logger.info(f"Searching web for context: {search_query}")
+            search_query = _clip_query(user_input)
+            logger.info("Searching web for context: %s", search_query)
             search_context = self._search_web(search_query)
         
         if search_context:
-            logger.info(f"Web search provided context ({len(search_context)} chars)")
+            logger.info("Web search provided context (%d chars)", len(search_context))
         else:
             logger.info("No web search context available - proceeding without it")
         
-        # Step 3: Query Grok with context
-        response = self._query_grok(user_input, search_context)
+        return search_context
+    
+    SEARCH_WAIT_SECONDS = 1.5  # How long a speculative answer waits for web search context
+    CLAIM_SEARCH_WAIT_SECONDS = 4.0  # Inputs with factual claims wait longer, but never indefinitely
+    
+    def answer(self, user_input: str) -> str:
+        """
+        Search the web and query Grok, overlapping the two round trips.
+        
+        The search always starts first. If the input has no factual claim, a Grok
+        call without context runs alongside it; the context-augmented answer is
+        preferred when the search returns within SEARCH_WAIT_SECONDS, otherwise
+        the speculative answer is used. Inputs with factual claims wait up to
+        CLAIM_SEARCH_WAIT_SECONDS for the search, then answer without it.
+        """
+        reply = self._phatic_reply(user_input)
+        if reply is not None:
+            return reply
+        
+        fut_search = self._pool.submit(self._get_search_context, user_input)
+        fut_speculative = None
+        if not _CLAIM_RE.search(user_input):
+            fut_speculative = self._pool.submit(self._query_grok, user_input, None)
+        
+        try:
+            search_context = fut_search.result(
+                timeout=self.SEARCH_WAIT_SECONDS if fut_speculative else self.CLAIM_SEARCH_WAIT_SECONDS
+            )
+        except FutureTimeoutError:
+            logger.info("Web search still running - using the answer without search context")
+            if fut_speculative is None:
+                return self._query_grok(user_input, None)
+            return fut_speculative.result()
+        
+        if search_context or fut_speculative is None:
+            if fut_speculative:
+                fut_speculative.cancel()  # Only helps if it hasn't started; otherwise its result is ignored
+            return self._query_grok(user_input, search_context)
+        # Search came back empty - the speculative call already is the no-context answer
+        return fut_speculative.result()
+    
+    def process_input(self, user_input: str) -> str:
+        """
+        Main method to process user input with all constraints.
+        
+        Args:
+            user_input: User's text input
+            
+        Returns:
+            Response string
+        """
+        # Step 1: Wait for silence detection
+        if not self._wait_for_silence():
+            self._log_violation("Response generated without silence timeout")
+            return "Interrupted"
+        
+        # Steps 2-3: Search web for context and query Grok (overlapped, see answer())
+        response = self.answer(user_input)
         
         # Step 4: Limit response length unless 'explain'
         response = self._limit_response_length(response, user_input)
         
         return response
     
+    def stream_input(self, user_input: str) -> Iterator[str]:
+        """
+        Like process_input, but yields the response text in pieces as Grok generates it.
+        
+        The word limit (unless 'explain') is applied while streaming, so the
+        concatenated chunks are the full response.
+        
+        Args:
+            user_input: User's text input
+            
+        Yields:
+            Response text chunks
+        """
+        if not self._wait_for_silence():
+            self._log_violation("Response generated without silence timeout")
+            yield "Interrupted"
+            return
+        
+        reply = self._phatic_reply(user_input)
+        if reply is not None:
+            yield reply
+            return
+        
+        # Answer started from an interim transcript while the user was still talking
+        speculative = self._take_speculation(user_input)
+        if speculative is not None:
+            try:
+                response = speculative.result()
+            except Exception as e:
+                logger.debug(f"Speculative answer failed, answering normally: {e}")
+            else:
+                logger.info("Using the answer started from the interim transcript")
+                yield self._limit_response_length(response, user_input)
+                return
+        
+        # Same budget as answer(): the search gets SEARCH_WAIT_SECONDS (CLAIM_SEARCH_WAIT_SECONDS
+        # for factual claims) before Grok starts streaming without it
+        fut_search = self._pool.submit(self._get_search_context, user_input)
+        try:
+            search_context = fut_search.result(
+                timeout=self.CLAIM_SEARCH_WAIT_SECONDS if _CLAIM_RE.search(user_input) else self.SEARCH_WAIT_SECONDS
+            )
+        except FutureTimeoutError:
+            logger.info("Web search still running - streaming the answer without search context")
+            search_context = None
+        
+        limit_words = self.explain_keyword not in user_input.lower()
+        text = ""
+        for chunk in self._query_grok_stream(user_input, search_context):
+            if limit_words and len((text + chunk).split()) > self.max_response_words:
+                # Emit only the words that still fit, then stop generating
+                remaining = self.max_response_words - len(text.split())
+                head = " ".join(chunk.split()[:remaining]) if remaining > 0 else ""
+                if head:
+                    yield (" " if chunk[:1].isspace() else "") + head
+                yield "..."
+                self._log_violation(f"Streamed response truncated at {self.max_response_words} words")
+                return
+            text += chunk
+            yield chunk
+    
+    def close(self):
+        """Close pooled HTTP connections and the microphone stream."""
+        self._listener_closed = True
+        self._listen_enabled.set()  # Wake the listener thread so it can exit
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._speech_pool.shutdown(wait=False, cancel_futures=True)
+        self._http.close()
+        self._serp_http.close()
+        if self.microphone is not None and self.microphone.stream is not None:
+            with self._mic_lock:
+                self.microphone.__exit__(None, None, None)
+    
     def start_listening(self):
         """Start background listening for interruption detection while speaking."""
         # No persistent listener needed - will start when speaking
@@ -707,21 +1443,144 @@ Quality guidelines:
     def stop_listening(self):
         """Stop any active listening."""
         self.is_listening = False
+        self._stop_background_listener(quiet=True)
         logger.info("Stopped listening")
     
-    def speak(self, text: str):
-        """Speak text (can be interrupted by live listening)."""
+    def speak(self, text: Union[str, Iterable[str]]):
+        """Speak text, or sentences as they arrive (can be interrupted by live listening)."""
         self._speak_text(text)
     
     def get_violations(self) -> List[Dict]:
         """Get all logged violations."""
-        return self.violations.copy()
+        # deque.copy() is atomic, unlike iterating while another thread appends
+        return [{'timestamp': ts, 'message': message} for ts, message in self.violations.copy()]
     
     def clear_violations(self):
         """Clear violation log."""
         self.violations.clear()
         logger.info("Violations log cleared")
     
+    def _init_streaming_recognition(self):
+        """
+        Set up Google Cloud Speech streaming recognition when it's available.
+        
+        Optional: needs google-cloud-speech and application default credentials
+        (GOOGLE_APPLICATION_CREDENTIALS). Without them listening uses recognize_google.
+        """
+        try:
+            from google.cloud import speech
+        except ImportError:
+            return
+        try:
+            self._speech_client = speech.SpeechClient()
+        except Exception as e:
+            logger.info(f"ℹ️  Cloud streaming recognition unavailable, using recognize_google: {e}")
+            return
+        self._speech_streaming_config = speech.StreamingRecognitionConfig(
+            config=speech.RecognitionConfig(
+                encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
+                sample_rate_hertz=16000,  # Matches self.microphone
+                language_code="en-US",
+            ),
+            interim_results=True,
+            single_utterance=True,  # Server ends the stream as soon as the user stops talking
+        )
+        self._speech_request = speech.StreamingRecognizeRequest
+        self._speech_utterance_end = speech.StreamingRecognizeResponse.SpeechEventType.END_OF_SINGLE_UTTERANCE
+        logger.info("✅ Using Cloud streaming speech recognition")
+    
+    def _stream_transcribe(self, timeout: float, phrase_time_limit: float) -> Optional[str]:
+        """
+        Transcribe one utterance with Cloud StreamingRecognize.
+        
+        Microphone chunks are sent while the user speaks, so the final transcript is
+        back almost as soon as they stop. Interim results mean the user is talking -
+        any speech still playing is interrupted straight away.
+        """
+        heard = threading.Event()
+        done = threading.Event()
+        self._discard_speculation()
+        speculations = 0
+        
+        with self._mic_lock:
+            source = self.microphone
+            logger.info("Listening...")
+            
+            def requests_gen():
+                started = time.time()
+                while not done.is_set():
+                    elapsed = time.time() - started
+                    if elapsed > timeout + phrase_time_limit or (elapsed > timeout and not heard.is_set()):
+                        return
+                    yield self._speech_request(audio_content=source.stream.read(source.CHUNK))
+            
+            try:
+                for response in self._speech_client.streaming_recognize(self._speech_streaming_config, requests_gen()):
+                    if response.speech_event_type == self._speech_utterance_end:
+                        # Server-side endpointing: stop sending audio so the final result comes back now
+                        done.set()
+                    for result in response.results:
+                        if not result.alternatives:
+                            continue
+                        if not result.is_final:
+                            heard.set()
+                            interim = result.alternatives[0].transcript.strip()
+                            if (self.speaking and not self.interrupt_speech
+                                    and not _is_filler(interim)):
+                                self._signal_interrupt()
+                            if (speculations < self.SPECULATION_MAX_PER_UTTERANCE
+                                    and result.stability >= self.SPECULATION_MIN_STABILITY
+                                    and self._speculate(interim)):
+                                speculations += 1
+                            continue
+                        text = result.alternatives[0].transcript.strip()
+                        if text:
+                            logger.info("Heard: %s", text)
+                            return text
+            finally:
+                done.set()
+        
+        logger.debug("No speech detected within timeout")
+        return None
+    
+    SPECULATION_MIN_STABILITY = 0.8  # Interim transcripts this stable are unlikely to change much
+    SPECULATION_MIN_WORDS = 3
+    SPECULATION_MAX_PER_UTTERANCE = 2
+    SPECULATION_MATCH_RATIO = 0.95  # Final transcript this similar to the interim reuses its answer
+    
+    def _speculate(self, interim: str) -> bool:
+        """
+        Start answering a stable interim transcript while the user is still talking.
+        Returns True if a new speculative answer was started.
+        """
+        if len(interim.split()) < self.SPECULATION_MIN_WORDS:
+            return False
+        current = self._speculation
+        if current is not None and self._transcripts_match(current[0], interim):
+            return False  # Already answering (nearly) this
+        self._discard_speculation()
+        logger.debug("Speculatively answering interim transcript: %s", interim)
+        self._speculation = (interim, self._pool.submit(self.answer, interim))
+        return True
+    
+    def _transcripts_match(self, a: str, b: str) -> bool:
+        return difflib.SequenceMatcher(None, a.lower(), b.lower()).ratio() >= self.SPECULATION_MATCH_RATIO
+    
+    def _discard_speculation(self):
+        spec, self._speculation = self._speculation, None
+        if spec is not None:
+            spec[1].cancel()  # Only helps if it hasn't started; otherwise its result is ignored
+    
+    def _take_speculation(self, user_input: str) -> Optional[Future]:
+        """The speculative answer for user_input, if the interim it was started on matches."""
+        spec, self._speculation = self._speculation, None
+        if spec is None:
+            return None
+        if self._transcripts_match(spec[0], user_input):
+            return spec[1]
+        spec[1].cancel()
+        return None
+    
     def _listen_and_transcribe(self, timeout: float = 5.0, phrase_time_limit: float = 10.0) -> Optional[str]:
         """
         Listen to microphone and transcribe speech to text.
@@ -733,14 +1592,24 @@ Quality guidelines:
         Returns:
             Transcribed text or None if no speech detected
         """
+        if self._speech_client is not None:
+            try:
+                return self._stream_transcribe(timeout, phrase_time_limit)
+            except Exception as e:
+                logger.warning(f"Streaming recognition failed, falling back to recognize_google: {e}")
+        
         try:
-            with self.microphone as source:
+            # Recalibrate every few turns (or after audio we couldn't understand), not before every listen
+            if (self._listens_since_calibration >= self.RECALIBRATE_EVERY_LISTENS
+                    or time.time() - self._ambient_calibrated_at > self.AMBIENT_RECALIBRATE_SECONDS):
+                self._calibrate(duration=0.5)
+            self._listens_since_calibration += 1
+            
+            with self._mic_lock:
                 logger.info("Listening...")
-                # Adjust for ambient noise before each listen
-                self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
                 # Listen for audio
                 audio = self.recognizer.listen(
-                    source, 
+                    self.microphone, 
                     timeout=timeout, 
                     phrase_time_limit=phrase_time_limit
                 )
@@ -748,13 +1617,14 @@ Quality guidelines:
             # Recognize speech
             logger.info("Processing speech...")
             text = self.recognizer.recognize_google(audio, language='en-US')
-            logger.info(f"Heard: {text}")
+            logger.info("Heard: %s", text)
             return text
         except sr.WaitTimeoutError:
             logger.debug("No speech detected within timeout")
             return None
         except sr.UnknownValueError:
             logger.warning("Could not understand audio")
+            self._listens_since_calibration = self.RECALIBRATE_EVERY_LISTENS  # Noise may have changed
             return None
         except sr.RequestError as e:
             logger.error(f"Speech recognition service error: {e}")
@@ -770,10 +1640,13 @@ Quality guidelines:
         Args:
             exit_phrases: List of phrases that will exit the chat (default: ['exit', 'goodbye', 'quit'])
         """
+        if not self.audio_available:
+            raise RuntimeError("Voice chat needs audio - create WrappedGrok with enable_voice=True")
+        
         if exit_phrases is None:
             exit_phrases = ['exit', 'goodbye', 'quit', 'stop', 'end']
         
-        exit_phrases_lower = [phrase.lower() for phrase in exit_phrases]
+        exit_phrases_lower = frozenset(phrase.lower() for phrase in exit_phrases)
         
         logger.info("=== Starting Voice Chat ===")
         logger.info(f"Say one of {exit_phrases} to exit")
@@ -793,26 +1666,28 @@ Quality guidelines:
                 
                 # Additional silence wait after input (as per requirement: "respond only after silence detection")
                 logger.debug("Waiting for silence after input before processing...")
-                time.sleep(self.silence_timeout)
+                self._wait_for_end_of_speech(self.silence_timeout)
                 
                 # Check for exit phrases
-                if user_input.lower() in exit_phrases_lower:
+                if user_input.lower().strip(" .!?") in exit_phrases_lower:  # STT may add punctuation
                     logger.info("Exit phrase detected. Ending voice chat.")
                     self.speak("Goodbye!")
                     break
                 
-                # Process input with all constraints
-                logger.info(f"Processing: {user_input}")
-                response = self.process_input(user_input)
+                # Process input with all constraints, streaming the response
+                logger.info("Processing: %s", user_input)
+                chunks = self.stream_input(user_input)
+                first = next(chunks, None)
                 
-                # Speak response (interruption detection starts automatically)
-                if response and response != "Interrupted":
-                    logger.info(f"Response: {response}")
-                    self.speak(response)
+                # Speak response sentence by sentence while the rest is still generating
+                # (interruption detection starts automatically)
+                if first and first != "Interrupted":
+                    sentences = self._stream_sentences(itertools.chain([first], chunks))
+                    self.speak(self._prefetch(sentences))
                     
                     # Wait for speech to finish (unless interrupted)
-                    if self.speech_thread and self.speech_thread.is_alive():
-                        self.speech_thread.join(timeout=30)
+                    if self.speech_future:
+                        wait([self.speech_future], timeout=30)
                 
         except KeyboardInterrupt:
             logger.info("Voice chat interrupted by user")